@@ -2,38 +2,129 @@
 Agentic AI Agent - A simple implementation for beginners
 """
 
+import asyncio
+import itertools
 import json
 import os
+import re
+import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from itertools import islice
+from enum import Enum
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
 from dotenv import load_dotenv
-import anthropic
+
+from client_pool import get_client, get_async_client
+from id_generator import task_ids
+from llm_cache import ResponseCache
+from memory_backend import LazyEpisodes
+from memory_eviction import EvictionQueue
+from memory_index import KeywordIndex, VectorIndex, HashingEmbedder, content_tokens
+from tools.base import as_async, run_sync
 
 # Load environment variables
 load_dotenv()
 
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "agent_config.json")
+
+# Plan step lines: their leading number, and the dependencies the planner was asked to state
+STEP_NUMBER = re.compile(r"^\W*(?:step\s*)?(\d+)\b", re.IGNORECASE)
+STEP_DEPENDENCIES = re.compile(r"\(\s*depends on:?([^)]*)\)", re.IGNORECASE)
+
+def load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """Load agent settings, falling back to built-in defaults if the file is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _slotted(cls):
+    """Rebuild a dataclass with __slots__ so instances carry no __dict__
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10+. A field
+    can be kept in another form by mapping its name to a property in
+    __field_properties__; the property takes the place of the field's slot,
+    and the slots it stores into are listed in __extra_slots__.
+    """
+    namespace = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    properties = namespace.pop('__field_properties__', {})
+    namespace['__slots__'] = tuple(name for name in field_names if name not in properties) + \
+        tuple(namespace.pop('__extra_slots__', ()))
+    for name in field_names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+    namespace.update(properties)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+class Priority(str, Enum):
+    """Task priority; members compare equal to their string values"""
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    
+    def __str__(self) -> str:
+        return self.value
+
+class Status(str, Enum):
+    """Task status; members compare equal to their string values"""
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    
+    def __str__(self) -> str:
+        return self.value
+
+@_slotted
 @dataclass
 class Task:
-    """Represents a task for the agent to complete"""
+    """Represents a task for the agent to complete
+    
+    The creation time is kept as an epoch timestamp in `created` and only
+    formatted when `created_at` is read. `created_at` may still be passed
+    as an ISO string (or datetime) and defaults to now.
+    """
     id: str
     description: str
-    priority: str = "medium"
-    status: str = "pending"
-    created_at: str = None
+    priority: Priority = Priority.MEDIUM
+    status: Status = Status.PENDING
+    created_at: Optional[str] = None
     
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+        # Share one enum member per value instead of a string per task
+        self.priority = Priority(self.priority)
+        self.status = Status(self.status)
+    
+    def _get_created_at(self) -> str:
+        return datetime.fromtimestamp(self.created).isoformat()
+    
+    def _set_created_at(self, value):
+        if value is None:
+            self.created = time.time()
+        elif isinstance(value, datetime):
+            self.created = value.timestamp()
+        else:
+            self.created = datetime.fromisoformat(value).timestamp()
+    
+    __field_properties__ = {'created_at': property(_get_created_at, _set_created_at)}
+    __extra_slots__ = ('created',)
 
+@_slotted
 @dataclass
 class Plan:
-    """Represents a plan with steps to complete a task"""
+    """Represents a plan with steps to complete a task
+    
+    Each step may carry a 'depends_on' list of earlier step indices. Steps
+    without one are treated as depending on the step before them.
+    """
     task_id: str
     steps: List[Dict[str, Any]]
     estimated_time: str = "unknown"
     confidence: float = 0.8
 
+@_slotted
 @dataclass
 class Result:
     """Represents the result of a task execution"""
@@ -48,149 +139,307 @@ class Result:
         if self.errors is None:
             self.errors = []
 
+class Episode(NamedTuple):
+    """Immutable record of one task execution
+    
+    Holds references to the task, plan and result instead of copies;
+    they are only converted to plain dicts by to_dict() when the episode
+    is persisted or exported.
+    """
+    task: Task
+    plan: Plan
+    result: Result
+    
+    @property
+    def success_rate(self) -> float:
+        return 1.0 if self.result.success else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the episode into the plain dict layout"""
+        return {
+            'task': asdict(self.task),
+            'plan': asdict(self.plan),
+            'result': asdict(self.result),
+            'success_rate': self.success_rate
+        }
+
+# Recalled memories beyond this many are returned without counting as accessed
+MAX_TOUCHED_MEMORIES = 10
+
 class Memory:
-    """Memory system for the agent"""
+    """Memory system for the agent
     
-    def __init__(self):
-        self.short_term = []  # Recent interactions
+    Long-term and episodic memory are capped at long_term_limit and
+    episodic_limit. When full, the entry ranked most forgettable by the
+    eviction policy (see memory_eviction.EvictionQueue) is dropped.
+    
+    With a backend (see memory_backend.SQLiteMemoryBackend), long-term and
+    episodic memory are written through to it and restored on startup.
+    Only episode ids and descriptions are loaded up front; episode bodies
+    are read from the backend when first used.
+    """
+    
+    def __init__(self, short_term_limit: int = 10, embedder=None, long_term_limit: int = 1000,
+                 episodic_limit: int = 500, eviction_policy: str = "decay", forgetting_rate: float = 0.01,
+                 backend=None):
+        self.short_term = deque(maxlen=short_term_limit)  # Recent interactions (ring buffer)
         self.long_term = {}   # Important facts and patterns
-        self.episodic = []    # Past experiences
+        self.episodic = {}    # Past experiences, keyed by episode id in insertion order
+        self.long_term_limit = long_term_limit
+        self.episodic_limit = episodic_limit
+        self._episode_ids = itertools.count()
+        
+        # Relevance indexes: embedding similarity when an embedder is given,
+        # otherwise keyword matching
+        if embedder is not None:
+            self.long_term_index = VectorIndex(embedder)
+            self.episodic_index = VectorIndex(embedder)
+        else:
+            self.long_term_index = KeywordIndex()
+            self.episodic_index = KeywordIndex()
+        
+        # Forgetting order for each bounded store
+        self.long_term_eviction = EvictionQueue(eviction_policy, forgetting_rate)
+        self.episodic_eviction = EvictionQueue(eviction_policy, forgetting_rate)
+        
+        self.backend = backend
+        if backend is not None:
+            self._load_from_backend()
+    
+    def _load_from_backend(self):
+        """Restore long-term memory and episode headers from the backend"""
+        for key, entry in self.backend.load_long_term().items():
+            self.long_term[key] = entry
+            self.long_term_index.add(key, key)
+            self.long_term_eviction.touch(key, entry['access_count'], entry['last_accessed'])
+        
+        headers = self.backend.load_episode_headers()
+        self.episodic = LazyEpisodes(self.backend, [episode_id for episode_id, _, _, _ in headers])
+        for episode_id, description, access_count, last_accessed in headers:
+            if description:
+                self.episodic_index.add(episode_id, description)
+            self.episodic_eviction.touch(episode_id, access_count, last_accessed)
+        self._episode_ids = itertools.count(self.backend.next_episode_id())
+        
+        # Limits may have been lowered since the data was written
+        while len(self.long_term) > self.long_term_limit:
+            self._forget_long_term()
+        while len(self.episodic) > self.episodic_limit:
+            self._forget_episode()
     
     def add_to_short_term(self, interaction: Dict[str, Any]):
         """Add recent interaction to short-term memory"""
+        # The deque drops the oldest interaction once the limit is reached
         self.short_term.append({
             'timestamp': datetime.now().isoformat(),
             'interaction': interaction
         })
-        # Keep only last 10 interactions
-        if len(self.short_term) > 10:
-            self.short_term.pop(0)
+    
+    def get_recent(self, n: int) -> List[Dict[str, Any]]:
+        """Get the last n short-term memories, oldest first"""
+        recent = list(islice(reversed(self.short_term), n))
+        recent.reverse()
+        return recent
     
     def add_to_long_term(self, key: str, value: Any):
         """Add important information to long-term memory"""
+        if key not in self.long_term and len(self.long_term) >= self.long_term_limit:
+            self._forget_long_term()
+        
+        now = time.time()
         self.long_term[key] = {
             'value': value,
             'timestamp': datetime.now().isoformat(),
-            'access_count': 0
+            'access_count': 0,
+            'last_accessed': now
         }
+        self.long_term_index.add(key, key)
+        self.long_term_eviction.touch(key, 0, now)
+        if self.backend is not None:
+            self.backend.save_long_term(key, self.long_term[key])
     
     def get_from_long_term(self, key: str) -> Optional[Any]:
         """Retrieve information from long-term memory"""
         if key in self.long_term:
-            self.long_term[key]['access_count'] += 1
+            self._touch_long_term(key)
             return self.long_term[key]['value']
         return None
     
-    def add_episode(self, episode: Dict[str, Any]):
+    def add_episode(self, episode):
         """Add a complete episode to episodic memory"""
-        self.episodic.append({
+        if len(self.episodic) >= self.episodic_limit:
+            self._forget_episode()
+        
+        now = time.time()
+        episode_id = next(self._episode_ids)
+        self.episodic[episode_id] = {
             'timestamp': datetime.now().isoformat(),
-            'episode': episode
-        })
+            'episode': episode,
+            'access_count': 0,
+            'last_accessed': now
+        }
+        self.episodic_eviction.touch(episode_id, 0, now)
+        
+        # Episodes are indexed by the description of their task
+        description = self._episode_description(episode)
+        if description:
+            self.episodic_index.add(episode_id, description)
+        
+        if self.backend is not None:
+            self.backend.save_episode(episode_id, self.episodic[episode_id], description)
+    
+    def _episode_description(self, episode) -> Optional[str]:
+        """Get the task description an episode is indexed by"""
+        if isinstance(episode, Episode):
+            return episode.task.description
+        task = episode.get('task')
+        if isinstance(task, dict):
+            return task.get('description')
+        return None
+    
+    def _touch_long_term(self, key: str):
+        """Record an access to a long-term memory so it is remembered for longer"""
+        entry = self.long_term[key]
+        entry['access_count'] += 1
+        entry['last_accessed'] = time.time()
+        self.long_term_eviction.touch(key, entry['access_count'], entry['last_accessed'])
+        if self.backend is not None:
+            self.backend.save_long_term(key, entry)
+    
+    def _touch_episode(self, episode_id: int):
+        """Record an access to an episode so it is remembered for longer"""
+        entry = self.episodic[episode_id]
+        entry['access_count'] += 1
+        entry['last_accessed'] = time.time()
+        self.episodic_eviction.touch(episode_id, entry['access_count'], entry['last_accessed'])
+        if self.backend is not None:
+            self.backend.touch_episode(episode_id, entry)
+    
+    def _forget_long_term(self):
+        """Evict the most forgettable long-term memory"""
+        key = self.long_term_eviction.pop()
+        if key is not None:
+            del self.long_term[key]
+            self.long_term_index.remove(key)
+            if self.backend is not None:
+                self.backend.delete_long_term(key)
+    
+    def _forget_episode(self):
+        """Evict the most forgettable episode"""
+        episode_id = self.episodic_eviction.pop()
+        if episode_id is not None:
+            del self.episodic[episode_id]
+            self.episodic_index.remove(episode_id)
+            if self.backend is not None:
+                self.backend.delete_episode(episode_id)
     
-    def get_relevant_memories(self, context: str) -> List[Dict[str, Any]]:
-        """Get memories relevant to current context"""
+    def get_relevant_memories(self, context: str, include_episodic: bool = False, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Get memories relevant to current context
+        
+        Returns the last 5 short-term interactions followed by up to `limit`
+        long-term (and optionally episodic) memories matching the context,
+        best matches first.
+        """
         relevant = []
         
         # Check short-term memory
-        for memory in self.short_term[-5:]:  # Last 5 interactions
-            relevant.append(memory)
+        relevant.extend(self.get_recent(5))  # Last 5 interactions
+        
+        # Look up long-term (and episodic) memories in the indexes
+        matches = [(score, self.long_term, key, self._touch_long_term)
+                   for key, score in self.long_term_index.search(context, limit)]
+        if include_episodic:
+            matches.extend((score, self.episodic, key, self._touch_episode)
+                           for key, score in self.episodic_index.search(context, limit))
+            matches.sort(key=lambda match: match[0], reverse=True)
         
-        # Check long-term memory for relevant keys
-        for key, value in self.long_term.items():
-            if context.lower() in key.lower():
-                relevant.append(value)
+        # The best recalled memories count as accessed; touching every match
+        # of a broad query would refresh the whole store and defeat eviction
+        for rank, (_, store, key, touch) in enumerate(matches[:limit]):
+            if rank < MAX_TOUCHED_MEMORIES:
+                touch(key)
+            relevant.append(store[key])
         
         return relevant
 
 class Agent:
     """Main agent class with autonomous capabilities"""
     
-    def __init__(self, name: str = "AgenticAI", personality: str = "helpful"):
+    def __init__(self, name: str = "AgenticAI", personality: str = "helpful", config: Optional[Dict[str, Any]] = None,
+                 memory_backend=None, response_cache: Optional[ResponseCache] = None, client=None):
         self.name = name
         self.personality = personality
-        self.memory = Memory()
+        self.config = config if config is not None else load_config()
+        memory_settings = self.config.get('memory_settings', {})
+        embedder = HashingEmbedder() if memory_settings.get('retrieval') == 'vector' else None
+        self.memory = Memory(
+            short_term_limit=memory_settings.get('short_term_limit', 10),
+            embedder=embedder,
+            long_term_limit=memory_settings.get('long_term_limit', 1000),
+            episodic_limit=memory_settings.get('episodic_limit', 500),
+            eviction_policy=memory_settings.get('eviction_policy', 'decay'),
+            forgetting_rate=memory_settings.get('forgetting_rate', 0.01),
+            backend=memory_backend
+        )
         self.tools = {}
         self.learning_rate = 0.1
         
-        # Initialize Claude client
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            self.claude_client = anthropic.Anthropic(api_key=api_key)
-        else:
-            self.claude_client = None
+        # Registered tools wrapped as coroutines with their configured timeouts
+        self.tool_settings = self.config.get('tool_settings', {})
+        self.async_tools = {}
+        
+        # Planning limits
+        planning_settings = self.config.get('planning_settings', {})
+        self.max_plan_steps = planning_settings.get('max_plan_steps', 20)
+        self.max_parallel_steps = planning_settings.get('max_parallel_steps', 4)
+        
+        # Reuse of plans from similar successful tasks
+        learning_settings = self.config.get('learning_settings', {})
+        self.reuse_plans = learning_settings.get('pattern_recognition', True)
+        self.plan_reuse_threshold = planning_settings.get('plan_reuse_threshold', 0.8)
+        
+        # Cache of Claude responses for repeated prompts
+        cache_settings = self.config.get('llm_cache', {})
+        if response_cache is None and cache_settings.get('enabled', False):
+            response_cache = ResponseCache(
+                max_entries=cache_settings.get('max_entries', 256),
+                ttl=cache_settings.get('ttl', 3600),
+                disk_path=cache_settings.get('disk_path')
+            )
+        self.response_cache = response_cache
+        
+        # Use the given Claude client, or the shared pooled one
+        self.client_pool_settings = self.config.get('client_pool', {})
+        self.claude_client = client if client is not None else get_client(**self.client_pool_settings)
+        if self.claude_client is None:
             print("⚠️  Warning: No ANTHROPIC_API_KEY found. Some features will be limited.")
     
     def analyze_task(self, task_description: str) -> Task:
         """Analyze and create a task from description"""
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
         # Use Claude to analyze task if available
         if self.claude_client:
             try:
-                response = self.claude_client.messages.create(
-                    model="claude-3-haiku-20240307",
-                    max_tokens=1000,
-                    messages=[{
-                        "role": "user",
-                        "content": f"Analyze this task and provide a structured response:\n{task_description}\n\nProvide: 1) Priority (high/medium/low), 2) Key requirements, 3) Estimated complexity"
-                    }]
-                )
-                analysis = response.content[0].text
-                # Extract priority from analysis
-                if "high" in analysis.lower():
-                    priority = "high"
-                elif "low" in analysis.lower():
-                    priority = "low"
-                else:
-                    priority = "medium"
+                analysis = self._complete(self._analysis_request(task_description))
+                priority = self._priority_from_analysis(analysis)
             except Exception as e:
                 print(f"⚠️  Claude analysis failed: {e}")
                 priority = "medium"
         else:
             priority = "medium"
         
-        task = Task(
-            id=task_id,
-            description=task_description,
-            priority=priority
-        )
-        
-        # Store in memory
-        self.memory.add_to_short_term({
-            'type': 'task_analysis',
-            'task_id': task_id,
-            'description': task_description,
-            'priority': priority
-        })
-        
-        return task
+        return self._record_task(task_description, priority)
     
     def create_plan(self, task: Task) -> Plan:
         """Create a plan to complete the task"""
-        steps = []
+        # Reuse the plan of a similar successful task without calling Claude
+        template = self._find_plan_template(task.description)
+        if template is not None:
+            return self._plan_from_template(task, *template)
         
         if self.claude_client:
             try:
-                response = self.claude_client.messages.create(
-                    model="claude-3-haiku-20240307",
-                    max_tokens=1000,
-                    messages=[{
-                        "role": "user",
-                        "content": f"Create a step-by-step plan for this task:\n{task.description}\n\nProvide 3-5 clear steps with tool requirements."
-                    }]
-                )
-                plan_text = response.content[0].text
-                
-                # Parse plan into steps (simplified)
-                lines = plan_text.split('\n')
-                for line in lines:
-                    if line.strip() and any(keyword in line.lower() for keyword in ['step', '1.', '2.', '3.', '4.', '5.']):
-                        steps.append({
-                            'description': line.strip(),
-                            'tool_required': self._identify_tool(line),
-                            'status': 'pending'
-                        })
+                plan_text = self._complete(self._planning_request(task.description))
+                steps = self._parse_plan_steps(plan_text)
             except Exception as e:
                 print(f"⚠️  Claude planning failed: {e}")
                 steps = self._create_default_plan(task)
@@ -199,11 +448,250 @@ class Agent:
         
         plan = Plan(
             task_id=task.id,
-            steps=steps
+            steps=self._limit_steps(steps)
         )
         
         return plan
     
+    def _find_plan_template(self, task_description: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Find the successful pattern most similar to a task, if similar enough to reuse
+        
+        Candidates come from the long-term memory index; similarity is the
+        Jaccard overlap of the two descriptions' words, stopwords left out,
+        and must reach plan_reuse_threshold (planning_settings.plan_reuse_threshold).
+        """
+        if not self.reuse_plans:
+            return None
+        task_tokens = content_tokens(task_description)
+        if not task_tokens:
+            return None
+        
+        best_key, best_score = None, 0.0
+        for key, _ in self.memory.long_term_index.search(task_description, 10):
+            if not key.startswith('successful_pattern_'):
+                continue
+            pattern = self.memory.long_term[key]['value']
+            if 'steps' not in pattern:
+                continue
+            pattern_tokens = content_tokens(pattern['description'])
+            score = len(task_tokens & pattern_tokens) / len(task_tokens | pattern_tokens)
+            if score > best_score:
+                best_key, best_score = key, score
+        
+        if best_key is None or best_score < self.plan_reuse_threshold:
+            return None
+        return self.memory.get_from_long_term(best_key), best_score
+    
+    def _plan_from_template(self, task: Task, pattern: Dict[str, Any], confidence: float) -> Plan:
+        """Build a plan for a task from a stored successful pattern"""
+        print(f"♻️  Reusing plan from similar task: {pattern['description']} (confidence {confidence:.2f})")
+        steps = [
+            {
+                'description': step['description'].replace(pattern['description'], task.description),
+                'tool_required': step['tool_required'],
+                'status': 'pending',
+                'depends_on': list(step['depends_on'])
+            }
+            for step in pattern['steps']
+        ]
+        return Plan(
+            task_id=task.id,
+            steps=steps,
+            estimated_time=f"{pattern['execution_time']:.2f}s",
+            confidence=confidence
+        )
+    
+    def run_batch(self, task_descriptions: List[str], poll_interval: float = 5.0,
+                  max_batch_size: int = 10000) -> List[Result]:
+        """Analyze, plan and execute many tasks with their Claude calls batched
+        
+        The analysis and planning prompts of every task are submitted
+        together through the Message Batches API, except those answered by
+        the response cache or by plan reuse. Each task is then planned from
+        its own replies and the plans are executed concurrently. Tasks whose
+        replies are missing fall back to the default priority and plan.
+        Results are returned in input order.
+        """
+        templates = [self._find_plan_template(description) for description in task_descriptions]
+        
+        replies = {}
+        if self.claude_client:
+            requests = {}
+            for i, description in enumerate(task_descriptions):
+                requests[f"analyze-{i}"] = self._analysis_request(description)
+                if templates[i] is None:
+                    requests[f"plan-{i}"] = self._planning_request(description)
+            try:
+                replies = self._complete_batch(requests, poll_interval, max_batch_size)
+            except Exception as e:
+                print(f"⚠️  Claude batch failed: {e}")
+        
+        prepared = []
+        for i, description in enumerate(task_descriptions):
+            analysis = replies.get(f"analyze-{i}")
+            priority = self._priority_from_analysis(analysis) if analysis is not None else "medium"
+            task = self._record_task(description, priority)
+            
+            if templates[i] is not None:
+                plan = self._plan_from_template(task, *templates[i])
+            else:
+                plan_text = replies.get(f"plan-{i}")
+                steps = self._parse_plan_steps(plan_text) if plan_text is not None else self._create_default_plan(task)
+                plan = Plan(task_id=task.id, steps=self._limit_steps(steps))
+            prepared.append((task, plan))
+        
+        # One event loop runs every plan, so memory is only updated from one thread
+        return run_sync(self._aexecute_plans(prepared))
+    
+    async def _aexecute_plans(self, prepared: List[Tuple[Task, Plan]]) -> List[Result]:
+        return list(await asyncio.gather(*(self.aexecute_plan(task, plan) for task, plan in prepared)))
+    
+    def _complete_batch(self, requests: Dict[str, Dict[str, Any]], poll_interval: float,
+                        max_batch_size: int) -> Dict[str, str]:
+        """Send requests through the Message Batches API, returning reply text by custom id"""
+        replies = {}
+        pending = {}
+        for custom_id, request in requests.items():
+            cached = self.response_cache.get(request) if self.response_cache is not None else None
+            if cached is not None:
+                replies[custom_id] = cached
+            else:
+                pending[custom_id] = request
+        
+        # Submit every chunk before waiting on any of them
+        custom_ids = list(pending)
+        batches = [
+            self.claude_client.messages.batches.create(requests=[
+                {"custom_id": custom_id, "params": pending[custom_id]}
+                for custom_id in custom_ids[start:start + max_batch_size]
+            ])
+            for start in range(0, len(custom_ids), max_batch_size)
+        ]
+        
+        failed = 0
+        for batch in batches:
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = self.claude_client.messages.batches.retrieve(batch.id)
+            
+            for entry in self.claude_client.messages.batches.results(batch.id):
+                if entry.result.type != "succeeded":
+                    failed += 1
+                    continue
+                text = entry.result.message.content[0].text
+                replies[entry.custom_id] = text
+                if self.response_cache is not None:
+                    self.response_cache.put(pending[entry.custom_id], text)
+        
+        if failed:
+            print(f"⚠️  {failed} batched Claude requests did not succeed")
+        return replies
+    
+    def _complete(self, request: Dict[str, Any]) -> str:
+        """Send a request to Claude and return the response text, using the cache if enabled"""
+        if self.response_cache is not None:
+            cached = self.response_cache.get(request)
+            if cached is not None:
+                return cached
+        
+        response = self.claude_client.messages.create(**request)
+        text = response.content[0].text
+        
+        if self.response_cache is not None:
+            self.response_cache.put(request, text)
+        return text
+    
+    def _analysis_request(self, task_description: str) -> Dict[str, Any]:
+        """Build the Claude request used to analyze a task"""
+        return {
+            "model": "claude-3-haiku-20240307",
+            "max_tokens": 1000,
+            "messages": [{
+                "role": "user",
+                "content": f"Analyze this task and provide a structured response:\n{task_description}\n\nProvide: 1) Priority (high/medium/low), 2) Key requirements, 3) Estimated complexity"
+            }]
+        }
+    
+    def _planning_request(self, task_description: str) -> Dict[str, Any]:
+        """Build the Claude request used to plan a task"""
+        return {
+            "model": "claude-3-haiku-20240307",
+            "max_tokens": 1000,
+            "messages": [{
+                "role": "user",
+                "content": f"Create a step-by-step plan for this task:\n{task_description}\n\nProvide 3-5 clear steps with tool requirements. End each step with \"(depends on: N, ...)\" listing the earlier steps it needs, or \"(depends on: none)\" if it can start right away."
+            }]
+        }
+    
+    def _priority_from_analysis(self, analysis: str) -> str:
+        """Extract priority from Claude's analysis text"""
+        if "high" in analysis.lower():
+            return "high"
+        elif "low" in analysis.lower():
+            return "low"
+        else:
+            return "medium"
+    
+    def _parse_plan_steps(self, plan_text: str) -> List[Dict[str, Any]]:
+        """Parse Claude's plan text into steps (simplified)
+        
+        A "(depends on: ...)" note on a step becomes its 'depends_on' list;
+        steps without one run after the step before them.
+        """
+        steps = []
+        numbers = {}  # Step number as written in the plan -> index in steps
+        lines = plan_text.split('\n')
+        for line in lines:
+            if line.strip() and any(keyword in line.lower() for keyword in ['step', '1.', '2.', '3.', '4.', '5.']):
+                description = line.strip()
+                match = STEP_DEPENDENCIES.search(description)
+                if match:
+                    description = (description[:match.start()] + description[match.end():]).strip()
+                number = STEP_NUMBER.match(description)
+                if number:
+                    numbers[int(number.group(1))] = len(steps)
+                
+                step = {
+                    'description': description,
+                    'tool_required': self._identify_tool(description),
+                    'status': 'pending'
+                }
+                if match:
+                    step['depends_on'] = [int(n) for n in re.findall(r"\d+", match.group(1))]
+                steps.append(step)
+        
+        for step in steps:
+            if 'depends_on' in step:
+                step['depends_on'] = [numbers[n] for n in step['depends_on'] if n in numbers]
+        return steps
+    
+    def _record_task(self, task_description: str, priority: str) -> Task:
+        """Create a task and store its analysis in memory"""
+        task_id = task_ids.new_id()
+        
+        task = Task(
+            id=task_id,
+            description=task_description,
+            priority=priority
+        )
+        
+        # Store in memory
+        self.memory.add_to_short_term({
+            'type': 'task_analysis',
+            'task_id': task_id,
+            'description': task_description,
+            'priority': priority
+        })
+        
+        return task
+    
+    def _limit_steps(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cap the plan length at max_plan_steps
+        
+        Steps keep the dependencies the planner stated; the rest run in order.
+        """
+        return steps[:self.max_plan_steps]
+    
     def _create_default_plan(self, task: Task) -> List[Dict[str, Any]]:
         """Create a default plan when Claude is not available"""
         return [
@@ -243,34 +731,66 @@ class Agent:
     
     def execute_plan(self, task: Task, plan: Plan) -> Result:
         """Execute the plan and return results"""
+        return run_sync(self.aexecute_plan(task, plan))
+    
+    async def aexecute_plan(self, task: Task, plan: Plan) -> Result:
+        """Execute the plan on the event loop and return results
+        
+        Steps whose dependencies have completed run concurrently, up to
+        max_parallel_steps at a time. A step whose dependency failed or
+        timed out is skipped.
+        """
         start_time = datetime.now()
-        tools_used = []
         errors = []
-        output_parts = []
+        outputs = {}
         
         print(f"🤖 {self.name} executing plan for task: {task.description}")
         
-        for i, step in enumerate(plan.steps, 1):
-            print(f"  📋 Step {i}: {step['description']}")
+        # Track unfinished dependencies and reverse edges for each step
+        waiting_on = {}
+        dependents = {i: [] for i in range(len(plan.steps))}
+        for i, step in enumerate(plan.steps):
+            deps = set(self._step_dependencies(step, i))
+            waiting_on[i] = deps
+            for d in deps:
+                dependents[d].append(i)
+        
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_steps))
+        
+        async def run(step: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self._arun_step(step)
+        
+        ready = [i for i, deps in waiting_on.items() if not deps]
+        running = {}
+        
+        while ready or running:
+            for i in ready:
+                step = plan.steps[i]
+                print(f"  📋 Step {i + 1}: {step['description']}")
+                running[asyncio.ensure_future(run(step))] = i
+            ready = []
             
-            try:
-                if step['tool_required'] in self.tools:
-                    tool_result = self.tools[step['tool_required']](step['description'])
-                    output_parts.append(f"Step {i}: {tool_result}")
-                    tools_used.append(step['tool_required'])
-                    step['status'] = 'completed'
-                else:
-                    # Simulate tool execution
-                    simulated_result = self._simulate_tool_execution(step['tool_required'], step['description'])
-                    output_parts.append(f"Step {i}: {simulated_result}")
-                    tools_used.append(step['tool_required'])
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                step = plan.steps[i]
+                try:
+                    outputs[i] = f"Step {i + 1}: {future.result()}"
                     step['status'] = 'completed'
-                    
-            except Exception as e:
-                error_msg = f"Step {i} failed: {str(e)}"
-                errors.append(error_msg)
-                step['status'] = 'failed'
-                print(f"    ❌ {error_msg}")
+                except Exception as e:
+                    error_msg = f"Step {i + 1} failed: {str(e)}"
+                    errors.append(error_msg)
+                    step['status'] = 'failed'
+                    print(f"    ❌ {error_msg}")
+                    self._skip_dependents(plan, i, dependents, errors)
+                
+                for j in dependents[i]:
+                    if plan.steps[j]['status'] == 'skipped':
+                        continue
+                    waiting_on[j].discard(i)
+                    if not waiting_on[j]:
+                        ready.append(j)
         
         execution_time = (datetime.now() - start_time).total_seconds()
         
@@ -280,8 +800,8 @@ class Agent:
         result = Result(
             task_id=task.id,
             success=success,
-            output="\n".join(output_parts),
-            tools_used=tools_used,
+            output="\n".join(outputs[i] for i in sorted(outputs)),
+            tools_used=[s['tool_required'] for s in plan.steps if s['status'] == 'completed'],
             execution_time=execution_time,
             errors=errors
         )
@@ -291,6 +811,29 @@ class Agent:
         
         return result
     
+    def _step_dependencies(self, step: Dict[str, Any], index: int) -> List[int]:
+        """Get a step's dependencies, ignoring any that are not earlier steps"""
+        if 'depends_on' not in step:
+            return [index - 1] if index > 0 else []
+        return [d for d in step['depends_on'] if 0 <= d < index]
+    
+    async def _arun_step(self, step: Dict[str, Any]) -> str:
+        """Run a single plan step with its tool, or simulate it"""
+        if step['tool_required'] in self.async_tools:
+            return await self.async_tools[step['tool_required']](step['description'])
+        return self._simulate_tool_execution(step['tool_required'], step['description'])
+    
+    def _skip_dependents(self, plan: Plan, failed: int, dependents: Dict[int, List[int]], errors: List[str]):
+        """Mark every step downstream of a failed step as skipped"""
+        stack = list(dependents[failed])
+        while stack:
+            j = stack.pop()
+            if plan.steps[j]['status'] == 'skipped':
+                continue
+            plan.steps[j]['status'] = 'skipped'
+            errors.append(f"Step {j + 1} skipped: depends on failed Step {failed + 1}")
+            stack.extend(dependents[j])
+    
     def _simulate_tool_execution(self, tool_name: str, description: str) -> str:
         """Simulate tool execution when actual tools aren't available"""
         simulations = {
@@ -306,13 +849,7 @@ class Agent:
     def _learn_from_execution(self, task: Task, plan: Plan, result: Result):
         """Learn from task execution to improve future performance"""
         # Store episode in memory
-        episode = {
-            'task': asdict(task),
-            'plan': asdict(plan),
-            'result': asdict(result),
-            'success_rate': 1.0 if result.success else 0.0
-        }
-        self.memory.add_episode(episode)
+        self.memory.add_episode(Episode(task, plan, result))
         
         # Update long-term memory with patterns
         if result.success:
@@ -321,7 +858,16 @@ class Agent:
                 {
                     'tools_used': result.tools_used,
                     'execution_time': result.execution_time,
-                    'success': True
+                    'success': True,
+                    'description': task.description,
+                    'steps': [
+                        {
+                            'description': step['description'],
+                            'tool_required': step['tool_required'],
+                            'depends_on': self._step_dependencies(step, i)
+                        }
+                        for i, step in enumerate(plan.steps)
+                    ]
                 }
             )
         
@@ -332,8 +878,17 @@ class Agent:
             self.learning_rate = max(self.learning_rate - 0.01, 0.05)
     
     def register_tool(self, name: str, tool_function):
-        """Register a tool that the agent can use"""
+        """Register a tool that the agent can use
+        
+        The tool may be a plain or an async function. Calls to it time out
+        after tool_settings.<name>.timeout seconds, if configured.
+        """
         self.tools[name] = tool_function
+        self.async_tools[name] = as_async(
+            tool_function,
+            timeout=self.tool_settings.get(name, {}).get('timeout'),
+            name=name
+        )
         print(f"🔧 Tool registered: {name}")
     
     def get_status(self) -> Dict[str, Any]:
@@ -348,4 +903,120 @@ class Agent:
                 'long_term_count': len(self.memory.long_term),
                 'episodic_count': len(self.memory.episodic)
             }
-        } 
\ No newline at end of file
+        } 
+
+# Stands in for "the shared client of the running event loop"
+SHARED_CLIENT = object()
+
+class AsyncAgent(Agent):
+    """Agent that issues its Claude calls concurrently on an asyncio event loop"""
+    
+    def __init__(self, name: str = "AgenticAI", personality: str = "helpful", config: Optional[Dict[str, Any]] = None,
+                 memory_backend=None, response_cache: Optional[ResponseCache] = None, client=None,
+                 async_client=None):
+        super().__init__(name, personality, config, memory_backend, response_cache, client)
+        
+        # Async Claude client alongside the sync one. Without one, the shared
+        # client of whichever event loop the agent is running on is used
+        self._async_client = async_client if async_client is not None else SHARED_CLIENT
+    
+    @property
+    def async_client(self):
+        """The async Claude client for the running event loop"""
+        if self._async_client is SHARED_CLIENT:
+            return get_async_client(**self.client_pool_settings)
+        return self._async_client
+    
+    @async_client.setter
+    def async_client(self, client):
+        # Setting None turns the async Claude calls off
+        self._async_client = client
+    
+    async def _acomplete(self, request: Dict[str, Any]) -> str:
+        """Send a request to Claude without blocking, using the cache if enabled"""
+        if self.response_cache is not None:
+            cached = self.response_cache.get(request)
+            if cached is not None:
+                return cached
+        
+        response = await self.async_client.messages.create(**request)
+        text = response.content[0].text
+        
+        if self.response_cache is not None:
+            self.response_cache.put(request, text)
+        return text
+    
+    async def _analyze_priority(self, task_description: str) -> str:
+        """Ask Claude for the task priority without blocking the event loop"""
+        if not self.async_client:
+            return "medium"
+        
+        try:
+            analysis = await self._acomplete(self._analysis_request(task_description))
+            return self._priority_from_analysis(analysis)
+        except Exception as e:
+            print(f"⚠️  Claude analysis failed: {e}")
+            return "medium"
+    
+    async def _plan_steps(self, task_description: str) -> Optional[List[Dict[str, Any]]]:
+        """Ask Claude for plan steps, returning None when the default plan should be used"""
+        if not self.async_client:
+            return None
+        
+        try:
+            plan_text = await self._acomplete(self._planning_request(task_description))
+            return self._parse_plan_steps(plan_text)
+        except Exception as e:
+            print(f"⚠️  Claude planning failed: {e}")
+            return None
+    
+    async def aanalyze_task(self, task_description: str) -> Task:
+        """Analyze and create a task from description without blocking the event loop"""
+        priority = await self._analyze_priority(task_description)
+        return self._record_task(task_description, priority)
+    
+    async def acreate_plan(self, task: Task) -> Plan:
+        """Create a plan to complete the task without blocking the event loop"""
+        template = self._find_plan_template(task.description)
+        if template is not None:
+            return self._plan_from_template(task, *template)
+        
+        steps = await self._plan_steps(task.description)
+        if steps is None:
+            steps = self._create_default_plan(task)
+        return Plan(task_id=task.id, steps=self._limit_steps(steps))
+    
+    async def prepare_task(self, task_description: str) -> Tuple[Task, Plan]:
+        """Analyze and plan a task with both Claude calls in flight at once"""
+        # A reusable plan leaves only the analysis call
+        template = self._find_plan_template(task_description)
+        if template is not None:
+            task = await self.aanalyze_task(task_description)
+            return task, self._plan_from_template(task, *template)
+        
+        # Planning only needs the description, so it can overlap with analysis
+        priority, steps = await asyncio.gather(
+            self._analyze_priority(task_description),
+            self._plan_steps(task_description)
+        )
+        
+        task = self._record_task(task_description, priority)
+        if steps is None:
+            steps = self._create_default_plan(task)
+        
+        return task, Plan(task_id=task.id, steps=self._limit_steps(steps))
+    
+    async def run_task(self, task_description: str) -> Result:
+        """Analyze, plan and execute a single task"""
+        task, plan = await self.prepare_task(task_description)
+        return await self.aexecute_plan(task, plan)
+    
+    async def run_tasks(self, task_descriptions: List[str], max_concurrency: int = 10) -> List[Result]:
+        """Run many tasks concurrently, returning results in input order"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(task_description: str) -> Result:
+            async with semaphore:
+                return await self.run_task(task_description)
+        
+        return await asyncio.gather(*(run_one(d) for d in task_descriptions))
\ No newline at end of file
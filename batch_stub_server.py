@@ -0,0 +1,155 @@
+"""
+Batch Stub Server - A local stand-in for the Claude Messages API
+Serves /v1/messages and the Message Batches endpoints with canned replies,
+so Agent.run_batch can be exercised offline:
+
+    python batch_stub_server.py --port 8765
+    ANTHROPIC_API_KEY=stub ANTHROPIC_BASE_URL=http://127.0.0.1:8765 python your_script.py
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+def canned_reply(params: Dict[str, Any]) -> str:
+    """Produce a deterministic reply for an analysis or planning prompt"""
+    prompt = params["messages"][-1]["content"]
+    if isinstance(prompt, list):
+        prompt = " ".join(block.get("text", "") for block in prompt)
+    
+    if prompt.startswith("Analyze this task"):
+        return "1) Priority: medium\n2) Key requirements: gather and summarize information\n3) Estimated complexity: moderate"
+    if prompt.startswith("Create a step-by-step plan"):
+        return ("Step 1. Search for background information\n"
+                "Step 2. Find supporting sources\n"
+                "Step 3. Process and summarize the results")
+    return "This is a stub response."
+
+def make_message(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a canned reply in a Messages API response body"""
+    text = canned_reply(params)
+    return {
+        "id": f"msg_{uuid.uuid4().hex}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "stub"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 0, "output_tokens": len(text.split())}
+    }
+
+class StubState:
+    """Batches submitted to the stub server"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the endpoints the agent uses"""
+    
+    state = StubState()
+    
+    def do_POST(self):
+        body = self._read_json()
+        
+        if self.path.startswith("/v1/messages/batches"):
+            self._send_json(self._create_batch(body["requests"]))
+        elif self.path.startswith("/v1/messages"):
+            self._send_json(make_message(body))
+        else:
+            self._send_json({"type": "error", "error": {"type": "not_found_error", "message": self.path}}, 404)
+    
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        # v1 / messages / batches / {id} [/ results]
+        if len(parts) >= 4 and parts[:3] == ["v1", "messages", "batches"]:
+            batch_id = parts[3]
+            with self.state.lock:
+                batch = self.state.batches.get(batch_id)
+                results = self.state.results.get(batch_id)
+            if batch is None:
+                self._send_json({"type": "error", "error": {"type": "not_found_error", "message": batch_id}}, 404)
+            elif len(parts) == 5 and parts[4] == "results":
+                lines = "".join(json.dumps(result) + "\n" for result in results)
+                self._send(lines.encode("utf-8"), "application/binary")
+            else:
+                self._send_json(batch)
+        else:
+            self._send_json({"type": "error", "error": {"type": "not_found_error", "message": self.path}}, 404)
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _create_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Answer every request immediately and record the finished batch"""
+        batch_id = f"msgbatch_{uuid.uuid4().hex}"
+        now = datetime.now(timezone.utc)
+        host, port = self.server.server_address[:2]
+        
+        results = [
+            {"custom_id": request["custom_id"],
+             "result": {"type": "succeeded", "message": make_message(request["params"])}}
+            for request in requests
+        ]
+        batch = {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended",
+            "request_counts": {"processing": 0, "succeeded": len(results), "errored": 0,
+                               "canceled": 0, "expired": 0},
+            "created_at": now.isoformat(),
+            "ended_at": now.isoformat(),
+            "expires_at": (now + timedelta(days=1)).isoformat(),
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"http://{host}:{port}/v1/messages/batches/{batch_id}/results"
+        }
+        
+        with self.state.lock:
+            self.state.batches[batch_id] = batch
+            self.state.results[batch_id] = results
+        return batch
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+    
+    def _send_json(self, payload: Dict[str, Any], status: int = 200):
+        self._send(json.dumps(payload).encode("utf-8"), "application/json", status)
+    
+    def _send(self, data: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub server on a background thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Claude Messages API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"🧪 Stub Claude API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stub server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Client Pool - Process-wide, connection-pooled Claude clients
+"""
+
+import asyncio
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import anthropic
+import httpx
+
+from tools.base import run_sync
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_clients: Dict[Tuple, anthropic.Anthropic] = {}
+_async_clients: Dict[asyncio.AbstractEventLoop, Dict[Tuple, anthropic.AsyncAnthropic]] = {}
+_closing: Set[asyncio.Task] = set()
+_lock = threading.Lock()
+
+def _pool_key(api_key: str, max_connections: int, max_keepalive_connections: int,
+              keepalive_expiry: float) -> Tuple:
+    return (api_key, max_connections, max_keepalive_connections, keepalive_expiry)
+
+def _limits(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+
+def get_client(api_key: Optional[str] = None,
+               max_connections: int = DEFAULT_MAX_CONNECTIONS,
+               max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+               keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY) -> Optional[anthropic.Anthropic]:
+    """Get the shared Claude client for these settings, creating it on first use
+    
+    Every caller with the same API key and pool settings gets the same
+    client, so agents share one HTTP connection pool and reuse kept-alive
+    connections instead of opening new ones. Returns None if no API key
+    is given or set in ANTHROPIC_API_KEY.
+    """
+    api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        return None
+    
+    key = _pool_key(api_key, max_connections, max_keepalive_connections, keepalive_expiry)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = anthropic.Anthropic(
+                api_key=api_key,
+                http_client=anthropic.DefaultHttpxClient(
+                    limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry)
+                )
+            )
+            _clients[key] = client
+        return client
+
+def get_async_client(api_key: Optional[str] = None,
+                     max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                     max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                     keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY) -> Optional[anthropic.AsyncAnthropic]:
+    """Get the shared async Claude client for these settings and the running event loop
+    
+    Async connections belong to the event loop that opened them, so each
+    event loop gets its own clients; call this from a coroutine. Clients
+    left behind by event loops that have since closed are closed in the
+    background on the current loop.
+    """
+    api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        return None
+    
+    loop = asyncio.get_running_loop()
+    key = _pool_key(api_key, max_connections, max_keepalive_connections, keepalive_expiry)
+    with _lock:
+        clients = _async_clients.get(loop)
+        if clients is None:
+            for stale in [stale for stale in _async_clients if stale.is_closed()]:
+                for client in _async_clients.pop(stale).values():
+                    task = loop.create_task(client.close())
+                    _closing.add(task)
+                    task.add_done_callback(_closing.discard)
+            clients = _async_clients[loop] = {}
+        
+        client = clients.get(key)
+        if client is None:
+            client = anthropic.AsyncAnthropic(
+                api_key=api_key,
+                http_client=anthropic.DefaultAsyncHttpxClient(
+                    limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry)
+                )
+            )
+            clients[key] = client
+        return client
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: anthropic.AsyncAnthropic):
+    """Close an async client, on its own event loop if that loop is still running"""
+    if not loop.is_running():
+        run_sync(client.close())
+        return
+    future = asyncio.run_coroutine_threadsafe(client.close(), loop)
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    # A loop can't wait on itself; the close then finishes once control returns to it
+    if running is not loop:
+        future.result()
+
+def close_clients():
+    """Close every shared client, sync and async, and forget them"""
+    with _lock:
+        clients: List[anthropic.Anthropic] = list(_clients.values())
+        async_clients = [(loop, client) for loop, pool in _async_clients.items() for client in pool.values()]
+        _clients.clear()
+        _async_clients.clear()
+    
+    for client in clients:
+        client.close()
+    for loop, client in async_clients:
+        _close_async_client(loop, client)
@@ -0,0 +1,123 @@
+"""
+Conversation History - Bounded message window for the MCP agent
+"""
+
+import json
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+Message = Dict[str, Any]
+
+def estimate_tokens(message: Message) -> int:
+    """Roughly estimate a message's token count (about 4 characters per token)"""
+    content = message["content"]
+    if isinstance(content, str):
+        return len(content) // 4 + 4
+    return len(json.dumps(content, default=str)) // 4 + 4
+
+def message_text(message: Message) -> str:
+    """Get the plain text of a message, ignoring tool blocks"""
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return " ".join(block.get("text", "") for block in content if block.get("type") == "text")
+
+class ConversationHistory:
+    """Conversation window bounded by message count and estimated tokens
+    
+    Messages are grouped into turns, each starting with a plain user
+    message, so tool calls are never separated from their results. When
+    either budget is exceeded the oldest turns are dropped and folded into
+    a rolling summary of at most max_summary_chars, which is sent ahead of
+    the remaining messages. The most recent turn is always kept. The
+    message list is built once per change and reused between requests.
+    """
+    
+    def __init__(self, max_messages: int = 10, max_tokens: int = 4000, max_summary_chars: int = 2000,
+                 summarizer: Optional[Callable[[List[Message]], str]] = None):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.max_summary_chars = max_summary_chars
+        self.summarizer = summarizer or self._summarize_turn
+        
+        self.turns: deque = deque()
+        self.message_count = 0
+        self.token_count = 0
+        self.summary_lines: deque = deque()
+        self.summary_chars = 0
+        self._messages: Optional[List[Message]] = None
+    
+    def __len__(self) -> int:
+        return self.message_count
+    
+    def append(self, message: Message):
+        """Add a message, trimming the oldest turns if over budget"""
+        starts_turn = message["role"] == "user" and isinstance(message["content"], str)
+        if starts_turn or not self.turns:
+            self.turns.append([message])
+        else:
+            self.turns[-1].append(message)
+        
+        self.message_count += 1
+        self.token_count += estimate_tokens(message)
+        self._messages = None
+        self._trim()
+    
+    def messages(self) -> List[Message]:
+        """Get the messages to send: the summary (if any) then the retained turns
+        
+        The returned list is shared until the history changes; don't modify it.
+        """
+        if self._messages is None:
+            messages = []
+            if self.summary_lines:
+                summary = "Summary of the earlier conversation:\n" + "\n".join(self.summary_lines)
+                messages.append({"role": "user", "content": summary})
+            for turn in self.turns:
+                messages.extend(turn)
+            self._messages = messages
+        return self._messages
+    
+    @property
+    def summary(self) -> str:
+        return "\n".join(self.summary_lines)
+    
+    def clear(self):
+        """Forget all messages and the summary"""
+        self.turns.clear()
+        self.summary_lines.clear()
+        self.message_count = 0
+        self.token_count = 0
+        self.summary_chars = 0
+        self._messages = None
+    
+    def _trim(self):
+        """Drop the oldest turns into the summary until within budget"""
+        while len(self.turns) > 1 and (self.message_count > self.max_messages or self.token_count > self.max_tokens):
+            turn = self.turns.popleft()
+            self.message_count -= len(turn)
+            self.token_count -= sum(estimate_tokens(message) for message in turn)
+            
+            line = self.summarizer(turn)
+            self.summary_lines.append(line)
+            self.summary_chars += len(line) + 1
+            while self.summary_chars > self.max_summary_chars and len(self.summary_lines) > 1:
+                self.summary_chars -= len(self.summary_lines.popleft()) + 1
+    
+    def _summarize_turn(self, turn: List[Message]) -> str:
+        """Summarize a turn as one line: the question, the tools used and the answer"""
+        question = message_text(turn[0])[:150]
+        answer = ""
+        tools = []
+        for message in turn[1:]:
+            if message["role"] == "assistant":
+                answer = message_text(message) or answer
+                if not isinstance(message["content"], str):
+                    tools.extend(block["name"] for block in message["content"] if block.get("type") == "tool_use")
+        
+        line = f"- User: {question}"
+        if tools:
+            line += f" | Tools: {', '.join(tools)}"
+        if answer:
+            line += f" | Assistant: {answer[:150]}"
+        return line
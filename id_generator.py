@@ -0,0 +1,60 @@
+"""
+ID Generator - Sortable, collision-free identifiers for tasks
+"""
+
+import os
+import threading
+import time
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+RANDOM_BITS = 80
+
+class IdGenerator:
+    """Generates monotonic ULID-style IDs
+    
+    Each ID encodes a 48-bit millisecond timestamp followed by 80 random
+    bits as 26 Crockford base32 characters, so IDs sort by creation time.
+    Within one millisecond (or if the clock steps backwards) the random
+    part is incremented instead of redrawn, so IDs from one generator are
+    strictly increasing. A lock makes it thread-safe, and the random part
+    is redrawn after a fork so parent and child never share a sequence.
+    """
+    
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.last_ms = -1
+        self.last_random = 0
+        self.pid = os.getpid()
+    
+    def new_id(self) -> str:
+        """Generate the next ID"""
+        with self.lock:
+            now_ms = time.time_ns() // 1_000_000
+            pid = os.getpid()
+            
+            if pid != self.pid or now_ms > self.last_ms:
+                self.pid = pid
+                self.last_ms = max(now_ms, self.last_ms)
+                self.last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+            else:
+                self.last_random += 1
+                if self.last_random >> RANDOM_BITS:
+                    # Random part overflowed: borrow the next millisecond
+                    self.last_ms += 1
+                    self.last_random = 0
+            
+            value = (self.last_ms << RANDOM_BITS) | self.last_random
+        
+        return self.prefix + self._encode(value)
+    
+    def _encode(self, value: int) -> str:
+        """Encode a 128-bit value as 26 Crockford base32 characters"""
+        chars = []
+        for _ in range(26):
+            chars.append(CROCKFORD_BASE32[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+# Shared by every agent in the process so task IDs stay unique and ordered
+task_ids = IdGenerator("task_")
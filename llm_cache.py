@@ -0,0 +1,101 @@
+"""
+LLM Cache - Content-addressed cache for Claude responses
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class ResponseCache:
+    """Caches response text keyed by a hash of the full request
+    
+    The key covers the model, messages and every other parameter, so any
+    change to the prompt or settings is a miss. Entries live in an
+    in-memory LRU of max_entries and, if disk_path is given, in an SQLite
+    file shared across runs. Entries older than ttl seconds are ignored.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self.disk = None
+        if disk_path:
+            self.disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self.disk.execute("PRAGMA journal_mode=WAL")
+            self.disk.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL NOT NULL, text TEXT NOT NULL)"
+            )
+            self.disk.commit()
+    
+    def make_key(self, request: Dict[str, Any]) -> str:
+        """Hash a request's parameters into a cache key"""
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """Get the cached response text for a request, if fresh"""
+        key = self.make_key(request)
+        now = time.time()
+        
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.entries.pop(key, None)
+            
+            if self.disk is not None:
+                row = self.disk.execute("SELECT created, text FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[0] <= self.ttl:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[1]
+            
+            self.misses += 1
+            return None
+    
+    def put(self, request: Dict[str, Any], text: str):
+        """Cache the response text for a request"""
+        key = self.make_key(request)
+        created = time.time()
+        
+        with self.lock:
+            self._remember(key, created, text)
+            if self.disk is not None:
+                with self.disk:
+                    self.disk.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, created, text))
+    
+    def clear(self):
+        """Drop every cached response"""
+        with self.lock:
+            self.entries.clear()
+            if self.disk is not None:
+                with self.disk:
+                    self.disk.execute("DELETE FROM responses")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries)
+        }
+    
+    def _remember(self, key: str, created: float, text: str):
+        """Store an entry in the in-memory LRU, evicting the oldest if full"""
+        self.entries[key] = (created, text)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -3,21 +3,21 @@ Simple MCP Demo
 Demonstrates the Model Context Protocol concept with a basic implementation
 """
 
-import os
 from dotenv import load_dotenv
-import anthropic
+
+from client_pool import get_client
+from tools.safe_eval import evaluate
 
 # Load environment variables
 load_dotenv()
 
 def create_simple_mcp_agent():
     """Create a simple MCP-style agent"""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
+    # Shared, connection-pooled client
+    client = get_client()
+    if client is None:
         print("⚠️  No ANTHROPIC_API_KEY found. Using simulated responses.")
-        return None
-    
-    return anthropic.Anthropic(api_key=api_key)
+    return client
 
 def simulate_tool_usage(tool_name: str, params: dict) -> str:
     """Simulate tool usage for the MCP agent"""
@@ -25,9 +25,9 @@ def simulate_tool_usage(tool_name: str, params: dict) -> str:
     if tool_name == "calculator":
         expression = params.get("expression", "")
         try:
-            result = eval(expression)
+            result = evaluate(expression)
             return f"Calculator result: {expression} = {result}"
-        except:
+        except Exception:
             return f"Calculator error: Invalid expression '{expression}'"
     
     elif tool_name == "web_search":
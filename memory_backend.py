@@ -0,0 +1,226 @@
+"""
+Memory Backend - Durable storage for the agent's long-term and episodic memory
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS long_term (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_long_term_timestamp ON long_term (timestamp);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    description TEXT,
+    episode TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_timestamp ON episodes (timestamp);
+"""
+
+def _to_json(value: Any) -> Any:
+    """Convert records that know how to serialize themselves (such as episodes)"""
+    return value.to_dict() if hasattr(value, 'to_dict') else value
+
+class SQLiteMemoryBackend:
+    """SQLite store for Memory, in WAL mode with batched background commits
+    
+    Writes are queued and coalesced per row, then committed in a single
+    transaction every flush_interval seconds or once batch_size rows are
+    pending. Queued entries are held by reference and only serialized when
+    committed. Call flush() to force a commit; close() flushes and is also
+    run at interpreter exit.
+    """
+    
+    def __init__(self, path: str = "agent_memory.db", batch_size: int = 100, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        
+        # Pending writes keyed by (table, row key); None marks a delete
+        self.pending: Dict[Tuple[str, Any], Any] = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.closed = False
+        
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+    
+    def save_long_term(self, key: str, entry: Dict[str, Any]):
+        """Queue a long-term memory entry for writing"""
+        self._queue(("long_term", key), entry)
+    
+    def delete_long_term(self, key: str):
+        """Queue a long-term memory entry for deletion"""
+        self._queue(("long_term", key), None)
+    
+    def save_episode(self, episode_id: int, entry: Dict[str, Any], description: Optional[str] = None):
+        """Queue an episode for writing"""
+        self._queue(("episodes", episode_id), (description, entry))
+    
+    def touch_episode(self, episode_id: int, entry: Dict[str, Any]):
+        """Queue an update of an episode's access statistics"""
+        with self.lock:
+            # A pending full write already holds the live entry
+            if self.pending.get(("episodes", episode_id)) is not None:
+                return
+        self._queue(("episode_access", episode_id), entry)
+    
+    def delete_episode(self, episode_id: int):
+        """Queue an episode for deletion"""
+        with self.lock:
+            self.pending.pop(("episode_access", episode_id), None)
+        self._queue(("episodes", episode_id), None)
+    
+    def load_long_term(self) -> Dict[str, Dict[str, Any]]:
+        """Load all long-term memory entries"""
+        self.flush()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, value, timestamp, access_count, last_accessed FROM long_term ORDER BY timestamp"
+            ).fetchall()
+        return {
+            key: {'value': json.loads(value), 'timestamp': timestamp,
+                  'access_count': access_count, 'last_accessed': last_accessed}
+            for key, value, timestamp, access_count, last_accessed in rows
+        }
+    
+    def load_episode_headers(self) -> List[Tuple[int, Optional[str], int, float]]:
+        """Load (id, description, access_count, last_accessed) for every episode, without bodies"""
+        self.flush()
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, description, access_count, last_accessed FROM episodes ORDER BY id"
+            ).fetchall()
+    
+    def load_episode(self, episode_id: int) -> Optional[Dict[str, Any]]:
+        """Load a single episode record"""
+        self.flush()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT episode, timestamp, access_count, last_accessed FROM episodes WHERE id = ?",
+                (episode_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        episode, timestamp, access_count, last_accessed = row
+        return {'timestamp': timestamp, 'episode': json.loads(episode),
+                'access_count': access_count, 'last_accessed': last_accessed}
+    
+    def next_episode_id(self) -> int:
+        """Get the id to give the next new episode"""
+        self.flush()
+        with self.lock:
+            (max_id,) = self.conn.execute("SELECT MAX(id) FROM episodes").fetchone()
+        return 0 if max_id is None else max_id + 1
+    
+    def flush(self):
+        """Commit all pending writes in one transaction"""
+        with self.lock:
+            if not self.pending or self.closed:
+                return
+            pending, self.pending = self.pending, {}
+            
+            with self.conn:
+                for (table, key), item in pending.items():
+                    if table == "long_term":
+                        if item is None:
+                            self.conn.execute("DELETE FROM long_term WHERE key = ?", (key,))
+                        else:
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO long_term VALUES (?, ?, ?, ?, ?)",
+                                (key, json.dumps(item['value'], default=str), item['timestamp'],
+                                 item['access_count'], item['last_accessed'])
+                            )
+                    elif table == "episodes":
+                        if item is None:
+                            self.conn.execute("DELETE FROM episodes WHERE id = ?", (key,))
+                        else:
+                            description, entry = item
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?)",
+                                (key, description, json.dumps(_to_json(entry['episode']), default=str),
+                                 entry['timestamp'], entry['access_count'], entry['last_accessed'])
+                            )
+                    else:
+                        self.conn.execute(
+                            "UPDATE episodes SET access_count = ?, last_accessed = ? WHERE id = ?",
+                            (item['access_count'], item['last_accessed'], key)
+                        )
+    
+    def close(self):
+        """Flush pending writes and close the database"""
+        if self.closed:
+            return
+        self.wakeup.set()
+        self.flush()
+        with self.lock:
+            self.closed = True
+            self.conn.close()
+        atexit.unregister(self.close)
+    
+    def _queue(self, key: Tuple[str, Any], item: Any):
+        """Add a write to the pending batch, waking the writer when the batch is full"""
+        with self.lock:
+            self.pending[key] = item
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.wakeup.set()
+    
+    def _write_loop(self):
+        """Background thread committing batches until the backend is closed"""
+        while not self.closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+class LazyEpisodes(MutableMapping):
+    """Episode mapping that keeps ids in RAM and loads bodies from the backend on first use"""
+    
+    def __init__(self, backend: SQLiteMemoryBackend, episode_ids: List[int]):
+        self.backend = backend
+        self.entries: Dict[int, Optional[Dict[str, Any]]] = dict.fromkeys(episode_ids)
+    
+    def __getitem__(self, episode_id: int) -> Dict[str, Any]:
+        entry = self.entries[episode_id]
+        if entry is None:
+            entry = self.backend.load_episode(episode_id)
+            if entry is None:
+                raise KeyError(episode_id)
+            self.entries[episode_id] = entry
+        return entry
+    
+    def __setitem__(self, episode_id: int, entry: Dict[str, Any]):
+        self.entries[episode_id] = entry
+    
+    def __delitem__(self, episode_id: int):
+        del self.entries[episode_id]
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.entries)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def loaded_count(self) -> int:
+        """Number of episodes whose bodies are currently in RAM"""
+        return sum(1 for entry in self.entries.values() if entry is not None)
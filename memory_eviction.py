@@ -0,0 +1,70 @@
+"""
+Memory Eviction - Decides which memories the agent forgets first
+"""
+
+import heapq
+import itertools
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+EVICTION_POLICIES = ("lru", "lfu", "decay")
+
+class EvictionQueue:
+    """Min-heap of memory keys ordered by how forgettable they are
+    
+    Re-scoring a key pushes a new heap entry and leaves the old one behind;
+    stale entries are skipped when popped. This keeps both touch() and
+    pop() at O(log n). The heap is rebuilt when stale entries pile up.
+    
+    Policies:
+        lru   - forget the least recently accessed memory
+        lfu   - forget the least frequently accessed memory (ties by recency)
+        decay - access count decays exponentially with age at forgetting_rate
+                per hour; forget the memory with the lowest decayed strength
+    """
+    
+    def __init__(self, policy: str = "decay", forgetting_rate: float = 0.01):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'. Choose from {EVICTION_POLICIES}")
+        self.policy = policy
+        self.forgetting_rate = forgetting_rate
+        self.heap: List[Tuple[Tuple[float, float], int, Hashable]] = []
+        self.current: Dict[Hashable, int] = {}
+        self.counter = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self.current)
+    
+    def priority(self, access_count: int, last_accessed: float) -> Tuple[float, float]:
+        """Score a memory; lower scores are evicted first"""
+        if self.policy == "lru":
+            return (last_accessed, 0.0)
+        if self.policy == "lfu":
+            return (float(access_count), last_accessed)
+        # strength(now) = (1 + count) * exp(-rate * (now - last) / 3600). The
+        # now term is shared by every key, so ordering by its log only needs
+        # log(1 + count) + rate * last / 3600, which does not change over time.
+        return (math.log1p(access_count) + self.forgetting_rate * last_accessed / 3600, 0.0)
+    
+    def touch(self, key: Hashable, access_count: int, last_accessed: float):
+        """Insert or re-score a key"""
+        seq = next(self.counter)
+        self.current[key] = seq
+        heapq.heappush(self.heap, (self.priority(access_count, last_accessed), seq, key))
+        
+        if len(self.heap) > 2 * len(self.current) + 64:
+            self.heap = [entry for entry in self.heap if self.current.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+    
+    def discard(self, key: Hashable):
+        """Stop tracking a key"""
+        self.current.pop(key, None)
+    
+    def pop(self) -> Optional[Hashable]:
+        """Remove and return the most forgettable key, or None if empty"""
+        while self.heap:
+            _, seq, key = heapq.heappop(self.heap)
+            if self.current.get(key) == seq:
+                del self.current[key]
+                return key
+        return None
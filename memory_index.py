@@ -0,0 +1,178 @@
+"""
+Memory Index - Fast lookup structures for the agent's memory
+"""
+
+import heapq
+import math
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Common English words that say nothing about what a text is about
+STOPWORDS = frozenset("""
+a about an and any are as at be been but by can could do does for from has have how i if in
+into is it its me my of on or our should so than that the their them then there these this
+those to up us was we were what when where which who why will with would you your
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def content_tokens(text: str) -> Set[str]:
+    """Get the distinct tokens of a text, leaving out stopwords"""
+    return set(tokenize(text)) - STOPWORDS
+
+class KeywordIndex:
+    """Inverted index mapping tokens to the keys of the entries containing them"""
+    
+    def __init__(self):
+        self.postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self.entry_tokens: Dict[Hashable, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.entry_tokens)
+    
+    def add(self, key: Hashable, text: str):
+        """Index an entry's text under its key, replacing any previous text"""
+        self.remove(key)
+        tokens = content_tokens(text)
+        self.entry_tokens[key] = tokens
+        for token in tokens:
+            self.postings[token].add(key)
+    
+    def remove(self, key: Hashable):
+        """Drop an entry from the index"""
+        tokens = self.entry_tokens.pop(key, None)
+        if not tokens:
+            return
+        for token in tokens:
+            keys = self.postings[token]
+            keys.discard(key)
+            if not keys:
+                del self.postings[token]
+    
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Tuple[Hashable, float]]:
+        """Find entries sharing tokens with the query, best matches first
+        
+        Only the posting lists of the query's tokens are visited; stopwords
+        are ignored. Each matching token adds its inverse document frequency
+        to an entry's score, so rare words count for more than common ones.
+        """
+        total = len(self.entry_tokens)
+        scores: Dict[Hashable, float] = defaultdict(float)
+        
+        for token in content_tokens(query):
+            keys = self.postings.get(token)
+            if not keys:
+                continue
+            weight = math.log(1 + total / len(keys))
+            for key in keys:
+                scores[key] += weight
+        
+        if limit is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+
+class HashingEmbedder:
+    """Local text embedder using the hashing trick over words and word pairs
+    
+    Each token is hashed (with a stable CRC32, so vectors survive restarts)
+    into one of `dim` signed buckets. Vectors are L2-normalized, so a dot
+    product between two of them is their cosine similarity.
+    """
+    
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dim) float32 matrix"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+class VectorIndex:
+    """Embedding index with all vectors kept in one contiguous NumPy matrix
+    
+    Has the same add/remove/search interface as KeywordIndex, so Memory can
+    use either. Any embedder with a `dim` attribute and an
+    `embed(texts) -> np.ndarray` method of normalized rows can be plugged in.
+    """
+    
+    def __init__(self, embedder=None, initial_capacity: int = 1024):
+        self.embedder = embedder or HashingEmbedder()
+        self.vectors = np.zeros((initial_capacity, self.embedder.dim), dtype=np.float32)
+        self.keys: List[Hashable] = []
+        self.rows: Dict[Hashable, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def add(self, key: Hashable, text: str):
+        """Embed an entry's text and store it under its key"""
+        vector = self.embedder.embed([text])[0]
+        
+        if key in self.rows:
+            self.vectors[self.rows[key]] = vector
+            return
+        
+        # Grow the matrix geometrically so appends stay amortized O(1)
+        if len(self.keys) == len(self.vectors):
+            grown = np.zeros((max(1, 2 * len(self.vectors)), self.embedder.dim), dtype=np.float32)
+            grown[:len(self.vectors)] = self.vectors
+            self.vectors = grown
+        
+        self.rows[key] = len(self.keys)
+        self.vectors[len(self.keys)] = vector
+        self.keys.append(key)
+    
+    def remove(self, key: Hashable):
+        """Drop an entry, moving the last row into its slot"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.vectors[row] = self.vectors[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+        self.keys.pop()
+    
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Tuple[Hashable, float]]:
+        """Find the entries most similar to the query, best matches first"""
+        return self.search_many([query], limit)[0]
+    
+    def search_many(self, queries: List[str], limit: Optional[int] = 10) -> List[List[Tuple[Hashable, float]]]:
+        """Score a batch of queries against every entry in one matrix product"""
+        count = len(self.keys)
+        if count == 0:
+            return [[] for _ in queries]
+        
+        scores = self.embedder.embed(queries) @ self.vectors[:count].T
+        k = count if limit is None else min(limit, count)
+        
+        results = []
+        for row_scores in scores:
+            # Partial sort: only the top k candidates are fully ordered
+            top = np.argpartition(-row_scores, k - 1)[:k]
+            top = top[np.argsort(-row_scores[top])]
+            results.append([(self.keys[i], float(row_scores[i])) for i in top if row_scores[i] > 0])
+        
+        return results
\ No newline at end of file
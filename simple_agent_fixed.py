@@ -3,21 +3,21 @@ Fixed Simple Agentic AI Example
 Bypasses LangChain compatibility issues by using direct Claude integration
 """
 
-import os
 from dotenv import load_dotenv
-import anthropic
+
+from client_pool import get_client
+from tools.safe_eval import evaluate
 
 # Load environment variables
 load_dotenv()
 
 def create_simple_agent():
     """Create a simple agentic AI using Claude directly"""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
+    # Shared, connection-pooled client
+    client = get_client()
+    if client is None:
         print("⚠️  No ANTHROPIC_API_KEY found. Using simulated responses.")
-        return None
-    
-    return anthropic.Anthropic(api_key=api_key)
+    return client
 
 def simulate_tool_usage(tool_name: str, input_data: str) -> str:
     """Simulate tool usage for the agent"""
@@ -44,7 +44,7 @@ def simulate_tool_usage(tool_name: str, input_data: str) -> str:
             if not all(c in allowed_chars for c in input_data):
                 return "Error: Invalid characters in expression"
             
-            result = eval(input_data)
+            result = evaluate(input_data)
             return f"Calculation: {input_data} = {result}"
         except Exception as e:
             return f"Error calculating '{input_data}': {str(e)}"
@@ -3,21 +3,20 @@ Simple Claude Agentic AI Demo
 Demonstrates agentic AI concepts using Claude directly
 """
 
-import os
 from dotenv import load_dotenv
-import anthropic
+
+from client_pool import get_client
 
 # Load environment variables
 load_dotenv()
 
 def create_claude_agent():
     """Create a simple agent using Claude directly"""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
+    # Shared, connection-pooled client
+    client = get_client()
+    if client is None:
         print("⚠️  No ANTHROPIC_API_KEY found. Using simulated responses.")
-        return None
-    
-    return anthropic.Anthropic(api_key=api_key)
+    return client
 
 def simulate_agent_response(question: str, claude_client=None):
     """Simulate an agentic AI response"""
@@ -3,38 +3,65 @@ Simple MCP (Model Context Protocol) Agent Example
 Demonstrates how to create an agentic AI system using MCP with Claude
 """
 
+import asyncio
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dotenv import load_dotenv
-import anthropic
+
+from client_pool import get_client
+from conversation_history import ConversationHistory
 
 # Import our MCP tools
-from tools import CalculatorTool, WebSearchTool, WeatherTool
+from tools import CalculatorTool, WebSearchTool, WeatherTool, as_async, run_sync
 
 # Load environment variables
 load_dotenv()
 
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "mcp_config.json")
+
+def load_mcp_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """Load MCP agent settings, falling back to built-in defaults if the file is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
 class MCPAgent:
     """Simple MCP Agent using Claude"""
     
-    def __init__(self, model: str = "claude-3-haiku-20240307", temperature: float = 0.7):
+    def __init__(self, model: str = "claude-3-haiku-20240307", temperature: float = 0.7, client=None,
+                 max_tool_workers: int = 8, max_tool_rounds: int = 5, config: Optional[Dict[str, Any]] = None):
         self.model = model
         self.temperature = temperature
         self.tools = {}
-        self.conversation_history = []
         
-        # Initialize Claude client
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            self.claude_client = anthropic.Anthropic(api_key=api_key)
-        else:
-            self.claude_client = None
+        # Bounded conversation window, sized by the context settings
+        self.config = config if config is not None else load_mcp_config()
+        context_settings = self.config.get('context', {})
+        self.history = ConversationHistory(
+            max_messages=context_settings.get('max_history', 10),
+            max_tokens=context_settings.get('max_history_tokens', 4000)
+        )
+        
+        # System prompt and tool blocks, rebuilt only when tools change
+        self._system_blocks = None
+        self._tool_blocks = None
+        
+        # Up to this many tool calls from one assistant turn run at once
+        self.max_tool_workers = max_tool_workers
+        self.max_tool_rounds = max_tool_rounds
+        
+        # Use the given Claude client, or the shared pooled one
+        self.claude_client = client if client is not None else get_client()
+        if self.claude_client is None:
             print("⚠️  Warning: No ANTHROPIC_API_KEY found. Using simulated responses.")
     
     def register_tool(self, tool):
         """Register a tool with the agent"""
         self.tools[tool.name] = tool
+        self._system_blocks = None
+        self._tool_blocks = None
         print(f"🔧 Tool registered: {tool.name} - {tool.description}")
     
     def get_available_tools(self) -> List[Dict[str, Any]]:
@@ -42,29 +69,27 @@ class MCPAgent:
         return [tool.get_schema() for tool in self.tools.values()]
     
     def chat(self, message: str) -> str:
-        """Chat with the agent"""
-        # Add user message to history
-        self.conversation_history.append({"role": "user", "content": message})
-        
-        # Create system prompt with tool information
-        system_prompt = self._create_system_prompt()
+        """Chat with the agent
         
-        # Create messages for Claude
-        messages = [{"role": "user", "content": system_prompt}] + self.conversation_history
+        Claude is given the registered tools' schemas. Whenever it replies
+        with tool calls, they are run and their results sent back, for up
+        to max_tool_rounds rounds, until it gives a final answer. Tool calls
+        made after the last round are not run.
+        """
+        # Add user message to history
+        self.history.append({"role": "user", "content": message})
         
         if self.claude_client:
             try:
-                response = self.claude_client.messages.create(
-                    model=self.model,
-                    temperature=self.temperature,
-                    max_tokens=1000,
-                    messages=messages
-                )
+                for round_number in range(self.max_tool_rounds + 1):
+                    response = self.claude_client.messages.create(**self._request_params())
+                    if round_number == self.max_tool_rounds or not self._handle_tool_use(response):
+                        break
                 
-                response_text = response.content[0].text
+                response_text = self._response_text(response)
                 
                 # Add assistant response to history
-                self.conversation_history.append({"role": "assistant", "content": response_text})
+                self.history.append({"role": "assistant", "content": response_text})
                 
                 return response_text
                 
@@ -74,6 +99,145 @@ class MCPAgent:
         else:
             return self._fallback_response(message)
     
+    def chat_stream(self, message: str) -> Iterator[str]:
+        """Chat with the agent, yielding response text as it arrives
+        
+        The full response is added to the conversation history once the
+        stream has finished.
+        """
+        # Add user message to history
+        self.history.append({"role": "user", "content": message})
+        
+        if not self.claude_client:
+            yield self._fallback_response(message)
+            return
+        
+        chunks = []
+        try:
+            for round_number in range(self.max_tool_rounds + 1):
+                with self.claude_client.messages.stream(**self._request_params()) as stream:
+                    for text in stream.text_stream:
+                        chunks.append(text)
+                        yield text
+                    response = stream.get_final_message()
+                
+                # Text before a tool call is part of that tool-use turn
+                if round_number == self.max_tool_rounds or not self._handle_tool_use(response):
+                    break
+                chunks = []
+        except Exception as e:
+            print(f"⚠️  Claude API error: {e}")
+            if not chunks:
+                yield self._fallback_response(message)
+            return
+        
+        if not "".join(chunks):
+            chunks = [self._response_text(response)]
+            yield chunks[0]
+        
+        # Add assistant response to history
+        self.history.append({"role": "assistant", "content": "".join(chunks)})
+    
+    def _response_text(self, response) -> str:
+        """Get the text of a final response, with a placeholder if it has none
+        
+        The Messages API rejects empty assistant turns, so one is never
+        added to the conversation history.
+        """
+        response_text = "".join(block.text for block in response.content if block.type == "text")
+        if response_text:
+            return response_text
+        if response.stop_reason == "tool_use":
+            return "I reached the limit of tool calls for one message before finishing."
+        return "I don't have a response to that."
+    
+    def _handle_tool_use(self, response) -> bool:
+        """Run the tool calls in a response and record them in the history
+        
+        Returns False if the response made no tool calls. Otherwise the
+        assistant turn and a user turn with every tool result are appended
+        to the conversation history, ready for the next request.
+        """
+        tool_calls = [block for block in response.content if block.type == "tool_use"]
+        if response.stop_reason != "tool_use" or not tool_calls:
+            return False
+        
+        assistant_content = []
+        for block in response.content:
+            if block.type == "text":
+                assistant_content.append({"type": "text", "text": block.text})
+            elif block.type == "tool_use":
+                assistant_content.append({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input})
+        self.history.append({"role": "assistant", "content": assistant_content})
+        
+        # Run every call from this turn at once
+        results = run_sync(self.aexecute_tools([(call.name, call.input) for call in tool_calls]))
+        self.history.append({
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": call.id,
+                    "content": json.dumps(result, default=str),
+                    "is_error": not result.get("success", False)
+                }
+                for call, result in zip(tool_calls, results)
+            ]
+        })
+        return True
+    
+    async def _arun_tool_call(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool call from Claude, turning exceptions into error results"""
+        print(f"🔧 Using tool: {tool_name} {params}")
+        try:
+            return await self.aexecute_tool(tool_name, params)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Tool '{tool_name}' failed: {str(e)}"
+            }
+    
+    def _api_tools(self) -> List[Dict[str, Any]]:
+        """Get the registered tools' schemas in the Messages API tool format"""
+        if self._tool_blocks is None:
+            self._tool_blocks = [
+                {
+                    "name": schema["name"],
+                    "description": schema["description"],
+                    "input_schema": schema["parameters"]
+                }
+                for schema in self.get_available_tools()
+            ]
+        return self._tool_blocks
+    
+    def _system_prompt_blocks(self) -> List[Dict[str, Any]]:
+        """Get the system prompt as a cacheable system block
+        
+        The cache breakpoint covers the tool definitions and the system
+        prompt, which stay the same from turn to turn, so Claude can reuse
+        that prefix instead of reprocessing it on every request.
+        """
+        if self._system_blocks is None:
+            self._system_blocks = [{
+                "type": "text",
+                "text": self._create_system_prompt(),
+                "cache_control": {"type": "ephemeral"}
+            }]
+        return self._system_blocks
+    
+    def _request_params(self) -> Dict[str, Any]:
+        """Build the Claude request for the current conversation"""
+        params = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": 1000,
+            "system": self._system_prompt_blocks(),
+            "messages": self.history.messages()
+        }
+        if self.tools:
+            params["tools"] = self._api_tools()
+        return params
+    
     def _create_system_prompt(self) -> str:
         """Create system prompt with tool information"""
         tools_info = []
@@ -90,8 +254,8 @@ Available tools:
 
 When a user asks a question that requires using tools:
 1. Think about which tools you need
-2. Explain which tools you would use and why
-3. Provide a helpful response
+2. Call them (independent tools can be called together in one turn)
+3. Provide a helpful response based on their results
 
 Always be helpful and explain your reasoning. If you don't need tools for a simple question, just answer directly."""
     
@@ -136,25 +300,57 @@ Just let me know what you need help with!"""
     
     def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a specific tool"""
-        if tool_name in self.tools:
-            return self.tools[tool_name].execute(params)
-        else:
+        return run_sync(self.aexecute_tool(tool_name, params))
+    
+    async def aexecute_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a specific tool without blocking the event loop, within its timeout"""
+        if tool_name not in self.tools:
             return {
                 "success": False,
                 "error": f"Tool '{tool_name}' not found"
             }
+        
+        tool = self.tools[tool_name]
+        if hasattr(tool, "aexecute"):
+            return await tool.aexecute(params)
+        # Tools without the async contract run in a worker thread
+        return await as_async(tool.execute, timeout=getattr(tool, "timeout", None), name=tool_name)(params)
     
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    async def aexecute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Execute many (tool name, params) calls concurrently, returning results in order
+        
+        At most max_tool_workers calls run at once. Exceptions and timeouts
+        become error results.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_tool_workers))
+        
+        async def run_one(tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._arun_tool_call(tool_name, params)
+        
+        return await asyncio.gather(*(run_one(name, params) for name, params in calls))
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Messages currently in the conversation window"""
+        return self.history.messages()
+    
+    def get_conversation_history(self) -> List[Dict[str, Any]]:
         """Get conversation history"""
         return self.conversation_history
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.history.clear()
         print("🗑️  Conversation history cleared")
 
 def create_mcp_agent() -> MCPAgent:
-    """Create and configure an MCP agent"""
+    """Create and configure an MCP agent
+    
+    CodeExecutorTool is left out, since Claude's tool calls run without
+    confirmation and its snippets run on this machine with the agent's
+    own file and network access. Register it explicitly to opt in.
+    """
     agent = MCPAgent()
     
     # Register tools
@@ -207,8 +403,11 @@ def main():
             if not user_input:
                 continue
             
-            response = agent.chat(user_input)
-            print(f"🤖 Agent: {response}")
+            # Stream the response so the first words show up right away
+            print("🤖 Agent: ", end="", flush=True)
+            for chunk in agent.chat_stream(user_input):
+                print(chunk, end="", flush=True)
+            print()
             
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
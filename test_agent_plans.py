@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for plan parsing and dependency-aware plan execution
+"""
+
+import asyncio
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent import Agent, Plan, Task
+
+
+def _agent(max_parallel_steps=4):
+    return Agent("PlanTestAgent", config={"planning_settings": {"max_parallel_steps": max_parallel_steps}})
+
+
+def _plan(steps):
+    return Plan(task_id="task", steps=[dict(step, status='pending') for step in steps])
+
+
+def test_parse_dependencies():
+    """"(depends on: ...)" notes become step indices; steps without one stay sequential"""
+    agent = _agent()
+    steps = agent._parse_plan_steps(
+        "Here is the plan:\n"
+        "Step 1: Search for sources\n"
+        "Step 2: Search for prices (depends on: none)\n"
+        "Step 3: Calculate the totals (depends on: 1, 2)\n"
+        "Step 4: Write the report\n"
+        "Step 5: Review the report (Depends on: 9)\n"
+    )
+    
+    assert len(steps) == 5, f"expected 5 steps, got {len(steps)}"
+    assert steps[2]['description'] == "Step 3: Calculate the totals", steps[2]['description']
+    assert 'depends_on' not in steps[0]
+    assert steps[1]['depends_on'] == []
+    assert steps[2]['depends_on'] == [0, 1]
+    assert 'depends_on' not in steps[3]
+    assert steps[4]['depends_on'] == [], "unknown step numbers should be dropped"
+    
+    dependencies = [agent._step_dependencies(step, i) for i, step in enumerate(steps)]
+    assert dependencies == [[], [], [0, 1], [2], []], dependencies
+
+
+def test_max_parallel_steps():
+    """Independent steps run concurrently, but never more than max_parallel_steps at once"""
+    agent = _agent(max_parallel_steps=2)
+    active = 0
+    peak = 0
+    
+    async def slow_search(query):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return f"results for {query}"
+    
+    agent.register_tool('web_search', slow_search)
+    plan = _plan([{'description': f"Search {i}", 'tool_required': 'web_search', 'depends_on': []} for i in range(6)])
+    result = agent.execute_plan(Task(id="task", description="Search six things"), plan)
+    
+    assert result.success and not result.errors, result.errors
+    assert all(step['status'] == 'completed' for step in plan.steps)
+    assert peak == 2, f"expected 2 steps at once, got {peak}"
+
+
+def test_failed_step_skips_dependents():
+    """Steps downstream of a failed step are skipped; independent steps still run"""
+    agent = _agent()
+    
+    def failing_calculator(expression):
+        raise ValueError("bad expression")
+    
+    agent.register_tool('calculator', failing_calculator)
+    plan = _plan([
+        {'description': "Calculate the totals", 'tool_required': 'calculator'},
+        {'description': "Summarize the totals", 'tool_required': 'text_processor', 'depends_on': [0]},
+        {'description': "Write the report", 'tool_required': 'text_processor', 'depends_on': [1]},
+        {'description': "Search for sources", 'tool_required': 'web_search', 'depends_on': []},
+    ])
+    result = agent.execute_plan(Task(id="task", description="Report on totals"), plan)
+    
+    statuses = [step['status'] for step in plan.steps]
+    assert statuses == ['failed', 'skipped', 'skipped', 'completed'], statuses
+    assert "Step 1 failed: bad expression" in result.errors, result.errors
+    assert "Step 2 skipped: depends on failed Step 1" in result.errors, result.errors
+    assert "Step 3 skipped: depends on failed Step 1" in result.errors, result.errors
+    assert result.tools_used == ['web_search'], result.tools_used
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_parse_dependencies,
+        test_max_parallel_steps,
+        test_failed_step_skips_dependents,
+    ]
+    
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
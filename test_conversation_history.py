@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP agent's bounded conversation history
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conversation_history import ConversationHistory
+from simple_mcp_agent import MCPAgent
+
+
+def _tool_turn(history, question, answer):
+    """Append a turn in which the assistant calls a tool before answering"""
+    history.append({"role": "user", "content": question})
+    history.append({"role": "assistant", "content": [
+        {"type": "text", "text": "Let me check."},
+        {"type": "tool_use", "id": "call_1", "name": "calculator", "input": {"expression": "2 + 2"}},
+    ]})
+    history.append({"role": "user", "content": [
+        {"type": "tool_result", "tool_use_id": "call_1", "content": "4", "is_error": False},
+    ]})
+    history.append({"role": "assistant", "content": answer})
+
+
+def test_message_budget():
+    """The oldest turns are dropped into a summary once max_messages is exceeded"""
+    history = ConversationHistory(max_messages=4)
+    for i in range(3):
+        history.append({"role": "user", "content": f"Question {i}"})
+        history.append({"role": "assistant", "content": f"Answer {i}"})
+    
+    messages = history.messages()
+    assert len(history) == 4, len(history)
+    assert messages[0]["role"] == "user" and messages[0]["content"].startswith("Summary of the earlier conversation")
+    assert "Question 0" in messages[0]["content"] and "Answer 0" in messages[0]["content"]
+    assert [message["content"] for message in messages[1:]] == ["Question 1", "Answer 1", "Question 2", "Answer 2"]
+    assert history.messages() is messages, "the message list should be reused until the history changes"
+
+
+def test_tool_calls_stay_with_results():
+    """Trimming drops whole turns, so a tool result never outlives its tool call"""
+    history = ConversationHistory(max_messages=5)
+    _tool_turn(history, "What is 2 + 2?", "It is 4.")
+    _tool_turn(history, "And 2 + 2 again?", "Still 4.")
+    
+    messages = history.messages()
+    assert "Tools: calculator" in messages[0]["content"], messages[0]["content"]
+    assert messages[1] == {"role": "user", "content": "And 2 + 2 again?"}, messages[1]
+    assert len(messages) == 5
+
+
+def test_token_budget_and_summary_cap():
+    """The token budget trims too, the latest turn is always kept, and the summary stays bounded"""
+    history = ConversationHistory(max_messages=100, max_tokens=50, max_summary_chars=200)
+    for i in range(10):
+        history.append({"role": "user", "content": f"Question {i} " + "x" * 400})
+    
+    assert len(history.turns) == 1, "only the latest turn should remain"
+    assert history.turns[0][0]["content"].startswith("Question 9")
+    assert len(history.summary) <= 200, len(history.summary)
+    assert "Question 8" in history.summary
+
+
+def test_agent_sends_trimmed_history():
+    """MCPAgent requests carry the bounded window, not the whole conversation"""
+    requests = []
+    
+    def create(**params):
+        requests.append(list(params["messages"]))
+        return SimpleNamespace(stop_reason="end_turn", content=[SimpleNamespace(type="text", text=f"Answer {len(requests)}")])
+    
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    agent = MCPAgent(client=client, config={"context": {"max_history": 4, "max_history_tokens": 4000}})
+    for i in range(6):
+        agent.chat(f"Question {i}")
+    
+    last = requests[-1]
+    assert len(last) <= 5, f"expected at most the summary and 4 messages, got {len(last)}"
+    assert last[0]["role"] == "user" and "Question 0" in last[0]["content"]
+    assert last[-1] == {"role": "user", "content": "Question 5"}
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_message_budget,
+        test_tool_calls_stay_with_results,
+        test_token_budget_and_summary_cap,
+        test_agent_sends_trimmed_history,
+    ]
+    
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for restoring memory from the SQLite backend after a restart
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent import Episode, Memory, Plan, Result, Task
+from memory_backend import SQLiteMemoryBackend
+
+
+def _episode(i):
+    task = Task(id=f"task_{i}", description=f"Summarize report number {i}")
+    plan = Plan(task_id=task.id, steps=[{'description': "Read the report", 'tool_required': 'file_operations', 'status': 'completed'}])
+    result = Result(task_id=task.id, success=True, output=f"Summary {i}", tools_used=['file_operations'], execution_time=0.1)
+    return Episode(task, plan, result)
+
+
+def _fill(path, episodes=3):
+    """Write some long-term memories and episodes, then shut the backend down"""
+    backend = SQLiteMemoryBackend(path, flush_interval=60)
+    memory = Memory(backend=backend)
+    memory.add_to_long_term("favorite_color", {"color": "blue"})
+    memory.add_to_long_term("home_city", "Paris")
+    memory.get_from_long_term("favorite_color")
+    for i in range(episodes):
+        memory.add_episode(_episode(i))
+    backend.close()
+
+
+def test_restart_restores_memory():
+    """Long-term memories, their access counts and episodes survive a restart"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.db")
+        _fill(path)
+        
+        backend = SQLiteMemoryBackend(path)
+        memory = Memory(backend=backend)
+        try:
+            assert memory.get_from_long_term("home_city") == "Paris"
+            assert memory.long_term["favorite_color"]['value'] == {"color": "blue"}
+            assert memory.long_term["favorite_color"]['access_count'] == 1
+            assert list(memory.episodic) == [0, 1, 2], list(memory.episodic)
+            
+            # New episodes continue after the restored ids
+            memory.add_episode(_episode(3))
+            assert list(memory.episodic) == [0, 1, 2, 3], list(memory.episodic)
+        finally:
+            backend.close()
+
+
+def test_episodes_load_lazily():
+    """Only episode headers load on startup; bodies are read on first use"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.db")
+        _fill(path)
+        
+        backend = SQLiteMemoryBackend(path)
+        memory = Memory(backend=backend)
+        try:
+            assert memory.episodic.loaded_count() == 0
+            
+            # Descriptions are indexed from the headers alone
+            assert sorted(key for key, _ in memory.episodic_index.search("report")) == [0, 1, 2]
+            assert memory.episodic.loaded_count() == 0
+            
+            entry = memory.episodic[2]
+            assert entry['episode']['task']['description'] == "Summarize report number 2"
+            assert entry['episode']['result']['output'] == "Summary 2"
+            assert memory.episodic.loaded_count() == 1
+        finally:
+            backend.close()
+
+
+def test_lowered_limit_applies_on_restart():
+    """Restoring into a smaller memory evicts the excess, and the eviction is persisted"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.db")
+        _fill(path, episodes=5)
+        
+        backend = SQLiteMemoryBackend(path)
+        memory = Memory(backend=backend, episodic_limit=2, long_term_limit=1)
+        assert len(memory.episodic) == 2
+        assert list(memory.long_term) == ["favorite_color"], "the accessed memory should be kept"
+        backend.close()
+        
+        backend = SQLiteMemoryBackend(path)
+        try:
+            assert len(backend.load_episode_headers()) == 2
+            assert list(backend.load_long_term()) == ["favorite_color"]
+        finally:
+            backend.close()
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_restart_restores_memory,
+        test_episodes_load_lazily,
+        test_lowered_limit_applies_on_restart,
+    ]
+    
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
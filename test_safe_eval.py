@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the safe expression evaluator and the calculator tool's batch modes
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tools.calculator import CalculatorTool
+from tools.safe_eval import evaluate, evaluate_bindings, evaluate_many
+
+
+EXPRESSIONS = [
+    "1 + 2 * 3",
+    "7 // 2",
+    "-7 % 3",
+    "2 ** 10",
+    "2 ** -1",
+    "1 / 3",
+    "0.1 + 0.2",
+    "3 ** 33",
+    "(10**17 + 1) - 10**17",
+    "(2**60 + 1) - 2**60",
+    "(10**17 + 1) - 10**17 + 0.5",
+    "(10**17 + 1) / 10**17",
+    "10**20 // 3",
+    "2**53 + 1",
+    "1 / 0",
+    "5 % 0",
+    "2 ** 100000",
+    "1e308 * 10",
+]
+
+
+def _outcome(expression, variables=None):
+    """Evaluate one expression, returning the exception instead of raising it"""
+    try:
+        return evaluate(expression, variables)
+    except Exception as e:
+        return e
+
+
+def _assert_same(single, batched, label):
+    if isinstance(single, Exception):
+        assert isinstance(batched, Exception), f"{label}: expected {single!r}, got {batched!r}"
+        assert type(batched) is type(single) and str(batched) == str(single), \
+            f"{label}: expected {single!r}, got {batched!r}"
+    else:
+        assert type(batched) is type(single) and batched == single, \
+            f"{label}: expected {single!r}, got {batched!r}"
+
+
+def test_batch_matches_single():
+    """evaluate_many gives the same result as evaluate for each expression"""
+    for expression, batched in zip(EXPRESSIONS, evaluate_many(EXPRESSIONS)):
+        _assert_same(_outcome(expression), batched, expression)
+
+
+def test_bindings_match_single():
+    """evaluate_bindings gives the same result as evaluate for each row"""
+    cases = [
+        ("x - y", {"x": [2**60 + 1, 5, 2.5, 10**17 + 1], "y": [2**60, 3, 1, 10**17]}),
+        ("x * y + 1", {"x": [3, 2**40, 0.5], "y": 2**20}),
+        ("x // y", {"x": [7, -7, 10**20], "y": [2, 2, 3]}),
+        ("x / y", {"x": [1, 1, 10**17 + 1], "y": [0, 3, 10**17]}),
+    ]
+    for expression, variables in cases:
+        for i, batched in enumerate(evaluate_bindings(expression, variables)):
+            row = {name: values if isinstance(values, (int, float)) else values[i]
+                   for name, values in variables.items()}
+            _assert_same(_outcome(expression, row), batched, f"{expression} {row}")
+
+
+def test_calculator_batch_matches_single():
+    """CalculatorTool batches agree with single calculations and report bad items"""
+    calculator = CalculatorTool(settings={})
+    expressions = ["(10**17 + 1) - 10**17", "2 ** 10", "1 / 0", 5, "import os"]
+    
+    response = calculator.execute({"expressions": expressions})
+    results = response["results"]
+    
+    assert len(results) == len(expressions)
+    for expression, result in zip(expressions[:3], results):
+        single = calculator.execute({"expression": expression})
+        assert result == single, f"{expression}: expected {single!r}, got {result!r}"
+    assert not results[3]["success"] and "must be a string" in results[3]["error"]
+    assert not results[4]["success"]
+    
+    response = calculator.execute({"expressions": "1 + 1"})
+    assert not response["success"]
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_batch_matches_single,
+        test_bindings_match_single,
+        test_calculator_batch_matches_single,
+    ]
+    
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the web search cache and its shared in-flight fetches
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tools.search_cache import SearchCache
+
+
+class CountingBackend:
+    """Search backend that counts calls and can hold them until released"""
+    
+    def __init__(self, fail=False):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = fail
+    
+    def search(self, query, max_results):
+        self.calls.append((query, max_results))
+        self.release.wait()
+        if self.fail:
+            raise ConnectionError("backend unavailable")
+        return [{"title": f"{query} {i}", "url": f"https://example.com/{i}"} for i in range(max_results)]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        time.sleep(0.01)
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Concurrent searches for the same query make one backend call"""
+    cache = SearchCache()
+    backend = CountingBackend()
+    backend.release.clear()
+    results = []
+    
+    def search(query):
+        results.append(cache.search(backend, query, 3))
+    
+    threads = [threading.Thread(target=search, args=(query,))
+               for query in ["Python asyncio"] * 4 + ["  python   ASYNCIO "] * 4]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: cache.stats()['shared'] == 7)
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert backend.calls == [("python asyncio", 3)], backend.calls
+    assert len(results) == 8 and all(result == results[0] for result in results)
+
+
+def test_cached_results_answer_smaller_requests():
+    """A cached top-n answers requests for fewer results; larger requests refetch"""
+    cache = SearchCache()
+    backend = CountingBackend()
+    
+    first = cache.search(backend, "bm25 ranking", 5)
+    assert cache.search(backend, "BM25 ranking", 3) == first[:3]
+    assert len(backend.calls) == 1, backend.calls
+    
+    assert len(cache.search(backend, "bm25 ranking", 8)) == 8
+    assert len(backend.calls) == 2, backend.calls
+
+
+def test_timeout_still_fills_cache():
+    """A caller that times out gets an error, but the fetch still fills the cache"""
+    cache = SearchCache(timeout=0.05)
+    backend = CountingBackend()
+    backend.release.clear()
+    
+    try:
+        cache.search(backend, "slow query", 2)
+        assert False, "expected a TimeoutError"
+    except TimeoutError as e:
+        assert "timed out" in str(e)
+    
+    backend.release.set()
+    _wait_for(lambda: not cache.in_flight)
+    assert len(cache.search(backend, "slow query", 2)) == 2
+    assert len(backend.calls) == 1, backend.calls
+
+
+def test_failed_fetch_is_not_cached():
+    """A failed fetch raises to the caller and the next search tries again"""
+    cache = SearchCache()
+    backend = CountingBackend(fail=True)
+    
+    for _ in range(2):
+        try:
+            cache.search(backend, "flaky query", 2)
+            assert False, "expected a ConnectionError"
+        except ConnectionError:
+            pass
+    assert len(backend.calls) == 2, backend.calls
+    assert not cache.in_flight
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        test_concurrent_misses_share_one_fetch,
+        test_cached_results_answer_smaller_requests,
+        test_timeout_still_fills_cache,
+        test_failed_fetch_is_not_cached,
+    ]
+    
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -3,8 +3,12 @@ MCP Tools Package
 Contains various tools that can be used with the MCP agent
 """
 
+from .base import Tool, as_async, run_sync
 from .calculator import CalculatorTool
+from .code_executor import CodeExecutorTool
 from .web_search import WebSearchTool
 from .weather import WeatherTool
+from .functions import web_search, calculator, data_analyzer, file_operations, code_executor, text_processor
 
-__all__ = ['CalculatorTool', 'WebSearchTool', 'WeatherTool'] 
\ No newline at end of file
+__all__ = ['Tool', 'as_async', 'run_sync', 'CalculatorTool', 'CodeExecutorTool', 'WebSearchTool', 'WeatherTool',
+           'web_search', 'calculator', 'data_analyzer', 'file_operations', 'code_executor', 'text_processor'] 
\ No newline at end of file
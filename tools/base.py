@@ -0,0 +1,74 @@
+"""
+Tool Base
+Async execution contract for tools, with per-tool timeouts
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Synchronous tool code runs here rather than in an event loop's default
+# executor, so a timed-out call never holds up asyncio.run() at shutdown
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="tool")
+
+def run_sync(awaitable: Awaitable) -> Any:
+    """Run a coroutine to completion from synchronous code
+    
+    Uses a fresh event loop, or a helper thread when this thread already
+    has a loop running.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(asyncio.run, awaitable).result()
+
+def as_async(function: Callable, timeout: Optional[float] = None, name: Optional[str] = None) -> Callable[..., Awaitable]:
+    """Adapt a tool function into a coroutine function with a timeout
+    
+    Plain functions run on TOOL_EXECUTOR; coroutine functions are awaited
+    directly. A call that takes longer than timeout seconds raises
+    TimeoutError. Cancelling the call stops waiting for it, but a plain
+    function's thread runs on to completion in the background.
+    """
+    name = name or getattr(function, "__name__", "tool")
+    
+    async def call(*args, **kwargs):
+        if asyncio.iscoroutinefunction(function):
+            awaitable = function(*args, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            awaitable = loop.run_in_executor(TOOL_EXECUTOR, functools.partial(function, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{name} timed out after {timeout}s") from None
+    
+    return call
+
+class Tool:
+    """Base class for MCP tools
+    
+    Subclasses implement execute(params), and may override _aexecute(params)
+    to run natively on the event loop. aexecute() applies the tool's timeout
+    and reports an overrun as a failed result instead of raising.
+    """
+    
+    name = "tool"
+    timeout: Optional[float] = None
+    
+    async def aexecute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the tool without blocking the event loop"""
+        try:
+            return await asyncio.wait_for(self._aexecute(params), self.timeout)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": f"Tool '{self.name}' timed out after {self.timeout}s"
+            }
+    
+    async def _aexecute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(TOOL_EXECUTOR, self.execute, params)
@@ -4,12 +4,18 @@ Provides mathematical calculation capabilities
 """
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-class CalculatorTool:
+from .base import Tool
+from .safe_eval import evaluate, evaluate_bindings, evaluate_many
+from .settings import load_tool_settings
+
+class CalculatorTool(Tool):
     """MCP Calculator Tool"""
     
-    def __init__(self):
+    def __init__(self, settings: Dict[str, Any] = None):
+        settings = load_tool_settings("calculator") if settings is None else settings
+        self.timeout = settings.get("timeout")
         self.name = "calculator"
         self.description = "Perform mathematical calculations"
         self.parameters = {
@@ -18,13 +24,26 @@ class CalculatorTool:
                 "expression": {
                     "type": "string",
                     "description": "The mathematical expression to calculate"
+                },
+                "expressions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several expressions to calculate in one batch"
+                },
+                "variables": {
+                    "type": "object",
+                    "description": "Variable values for the expression; lists evaluate it once per position"
                 }
-            },
-            "required": ["expression"]
+            }
         }
     
     def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the calculator tool"""
+        if "expressions" in params:
+            return self._execute_many(params["expressions"])
+        if "variables" in params:
+            return self._execute_bindings(params.get("expression", ""), params["variables"])
+        
         expression = params.get("expression", "")
         
         try:
@@ -36,7 +55,7 @@ class CalculatorTool:
                 }
             
             # Evaluate the expression
-            result = eval(expression)
+            result = evaluate(expression)
             
             return {
                 "success": True,
@@ -51,10 +70,84 @@ class CalculatorTool:
                 "error": f"Calculation error: {str(e)}"
             }
     
-    def _is_safe_expression(self, expression: str) -> bool:
+    def _execute_many(self, expressions: List[str]) -> Dict[str, Any]:
+        """Calculate a batch of expressions in one vectorized pass"""
+        if not isinstance(expressions, list):
+            return {
+                "success": False,
+                "error": "expressions must be a list of strings"
+            }
+        
+        safe = [isinstance(expression, str) and self._is_safe_expression(expression) for expression in expressions]
+        outcomes = iter(evaluate_many([expression for expression, ok in zip(expressions, safe) if ok]))
+        
+        results = []
+        for expression, ok in zip(expressions, safe):
+            if ok:
+                results.append(self._format_outcome(expression, expression, next(outcomes)))
+            elif not isinstance(expression, str):
+                results.append({
+                    "success": False,
+                    "error": f"Calculation error: expression must be a string, not {type(expression).__name__}"
+                })
+            else:
+                results.append({
+                    "success": False,
+                    "error": "Invalid characters in expression. Only numbers, operators, and parentheses allowed."
+                })
+        return self._batch_response(results)
+    
+    def _execute_bindings(self, expression: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate one expression for every position of the variable lists"""
+        if not self._is_safe_expression(expression, allow_variables=True):
+            return {
+                "success": False,
+                "error": "Invalid characters in expression. Only numbers, variables, operators, and parentheses allowed."
+            }
+        
+        try:
+            outcomes = evaluate_bindings(expression, variables)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Calculation error: {str(e)}"
+            }
+        
+        results = []
+        for i, outcome in enumerate(outcomes):
+            binding = ", ".join(
+                f"{name}={values if isinstance(values, (int, float)) else values[i]}"
+                for name, values in variables.items()
+            )
+            results.append(self._format_outcome(expression, f"{expression} ({binding})", outcome))
+        return self._batch_response(results)
+    
+    def _format_outcome(self, expression: str, label: str, outcome: Any) -> Dict[str, Any]:
+        """Shape one batch outcome like a single calculation's response"""
+        if isinstance(outcome, Exception):
+            return {
+                "success": False,
+                "error": f"Calculation error: {str(outcome)}"
+            }
+        return {
+            "success": True,
+            "result": outcome,
+            "expression": expression,
+            "formatted_result": f"Calculation: {label} = {outcome}"
+        }
+    
+    def _batch_response(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "success": any(result["success"] for result in results),
+            "result": [result.get("result") for result in results],
+            "results": results,
+            "formatted_result": "\n".join(result.get("formatted_result", result.get("error")) for result in results)
+        }
+    
+    def _is_safe_expression(self, expression: str, allow_variables: bool = False) -> bool:
         """Check if expression contains only safe characters"""
         # Allow numbers, basic operators, parentheses, and spaces
-        safe_pattern = r'^[0-9+\-*/().\s]+$'
+        safe_pattern = r'^[0-9A-Za-z_+\-*/().\s]+$' if allow_variables else r'^[0-9+\-*/().\s]+$'
         return bool(re.match(safe_pattern, expression))
     
     def get_schema(self) -> Dict[str, Any]:
@@ -0,0 +1,321 @@
+"""
+Code Executor Tool for MCP Agent
+Runs code snippets in resource-limited subprocesses. Python runs on a pool of
+warm worker interpreters, so startup cost is paid once per worker.
+
+This is not a sandbox: snippets run as the current user, with its access to
+the filesystem and network. Only register the tool where running model-written
+code on this machine is acceptable.
+"""
+
+import atexit
+import json
+import math
+import os
+import queue
+import re
+import select
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .base import Tool
+from .settings import load_tool_settings
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "code_worker.py")
+
+# Commands for the other languages, which start an interpreter per snippet
+INTERPRETERS = {
+    "javascript": ["node", "-e"],
+    "bash": ["bash", "--norc", "--noprofile", "-c"],
+}
+
+# V8 reserves far more address space than it uses, so node gets a heap limit instead
+HEAP_LIMIT_FLAGS = {
+    "javascript": "--max-old-space-size={}",
+}
+
+FENCED_CODE = re.compile(r"```[ \t]*(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL)
+
+def extract_python(text: str) -> Optional[str]:
+    """Get the Python code in some text: a fenced code block, or the text itself if it parses"""
+    match = FENCED_CODE.search(text)
+    code = match.group(1) if match else text
+    try:
+        compile(code, "<snippet>", "exec")
+    except (SyntaxError, ValueError):
+        return None
+    return code
+
+def describe_exit(returncode: int) -> str:
+    """Explain why a limited process stopped"""
+    if returncode == -signal.SIGXCPU:
+        return "CPU time limit exceeded"
+    if returncode < 0:
+        return f"Killed by {signal.Signals(-returncode).name}"
+    return f"Exited with code {returncode}"
+
+class WorkerError(RuntimeError):
+    """Raised when a worker process exits while running a snippet"""
+
+class _Worker:
+    """One warm Python interpreter running code_worker.py"""
+    
+    def __init__(self, pool: "WorkerPool"):
+        self.pool = pool
+        self.tasks = 0
+        command = [sys.executable, "-I", WORKER_PATH]
+        if pool.limit_resources:
+            # The CPU limit covers the worker's whole life; each snippet gets its own share
+            command.append(json.dumps(pool.limits(pool.timeout * pool.max_tasks_per_worker)))
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **pool.popen_options()
+        )
+    
+    def run(self, code: str, timeout: float) -> Dict[str, Any]:
+        self.tasks += 1
+        request = {"code": code, "cpu_seconds": math.ceil(timeout), "max_output": self.pool.max_output_chars}
+        try:
+            self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            raise WorkerError(describe_exit(self.process.wait())) from None
+        
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise TimeoutError(f"Execution timed out after {timeout}s")
+        line = self.process.stdout.readline()
+        if not line:
+            raise WorkerError(describe_exit(self.process.wait()))
+        return json.loads(line)
+    
+    def kill(self):
+        # Workers lead their own process group, which takes any children with them
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.process.wait()
+
+class WorkerPool:
+    """Pool of pre-started, resource-limited Python workers
+    
+    Each worker runs snippets one at a time in a fresh namespace, under a
+    per-snippet wall clock timeout and CPU limit. With limit_resources on,
+    workers also get memory, file size and open file limits, an isolated
+    interpreter (-I), a minimal environment and a scratch working
+    directory. None of this restricts which files or hosts a snippet can
+    reach. A worker is replaced after a timeout or crash, and after
+    max_tasks_per_worker snippets so state left behind by one snippet
+    doesn't build up.
+    """
+    
+    def __init__(self, workers: int = 2, timeout: float = 60, memory_limit_mb: int = 512,
+                 max_tasks_per_worker: int = 100, max_output_chars: int = 10000, limit_resources: bool = True):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_output_chars = max_output_chars
+        self.limit_resources = limit_resources
+        self.idle: "queue.Queue[_Worker]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.workdir = None
+    
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "WorkerPool":
+        """Build a pool from the tool_settings.code_executor config section"""
+        return cls(
+            workers=settings.get("workers", 2),
+            timeout=settings.get("timeout", 60),
+            memory_limit_mb=settings.get("memory_limit_mb", 512),
+            max_tasks_per_worker=settings.get("max_tasks_per_worker", 100),
+            max_output_chars=settings.get("max_output_chars", 10000),
+            limit_resources=settings.get("sandbox_mode", True),
+        )
+    
+    def limits(self, cpu_seconds: float) -> Dict[str, Any]:
+        """Resource limits for a child process"""
+        return {"memory_limit_mb": self.memory_limit_mb, "cpu_seconds": math.ceil(cpu_seconds)}
+    
+    def popen_options(self) -> Dict[str, Any]:
+        """Subprocess options giving a child process its own session, environment and directory"""
+        options = {"start_new_session": True}
+        if self.limit_resources:
+            options["cwd"] = self.workdir
+            options["env"] = {
+                "PATH": os.environ.get("PATH", os.defpath),
+                "LANG": "C.UTF-8",
+                "OPENBLAS_NUM_THREADS": "1",
+            }
+        return options
+    
+    def start(self):
+        """Start the workers, if they aren't running yet"""
+        with self.lock:
+            if self.workdir is not None:
+                return
+            if self.limit_resources and resource is None:
+                raise RuntimeError("Resource limits need the resource module (POSIX only)")
+            self.workdir = tempfile.mkdtemp(prefix="code_executor_")
+            for _ in range(self.workers):
+                self.idle.put(_Worker(self))
+            atexit.register(self.close)
+    
+    def run(self, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run a Python snippet on the next free worker, waiting for one if all are busy"""
+        self.start()
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        worker = self.idle.get()
+        try:
+            result = worker.run(code, timeout)
+        except (TimeoutError, WorkerError) as e:
+            worker.kill()
+            result = {"stdout": "", "stderr": "", "error": str(e)}
+        finally:
+            if worker.process.poll() is not None or worker.tasks >= self.max_tasks_per_worker:
+                worker.kill()
+                worker = _Worker(self)
+            self.idle.put(worker)
+        
+        result["success"] = result["error"] is None
+        result["duration"] = time.perf_counter() - started
+        return result
+    
+    def run_command(self, language: str, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run a snippet of another language in a fresh, equally limited interpreter"""
+        self.start()
+        timeout = timeout or self.timeout
+        command = INTERPRETERS[language]
+        if shutil.which(command[0]) is None:
+            return {"success": False, "stdout": "", "stderr": "", "error": f"{command[0]} is not installed", "duration": 0.0}
+        
+        if self.limit_resources:
+            limits = self.limits(timeout)
+            if language in HEAP_LIMIT_FLAGS:
+                command = command[:1] + [HEAP_LIMIT_FLAGS[language].format(self.memory_limit_mb)] + command[1:]
+                limits["memory_limit_mb"] = None
+            # The worker script applies the limits and execs the interpreter, since
+            # preexec_fn isn't safe to use from the threads tools run on
+            command = [sys.executable, "-I", WORKER_PATH, json.dumps(limits)] + command
+        
+        started = time.perf_counter()
+        with subprocess.Popen(
+            command + [code], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, **self.popen_options()
+        ) as process:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+                error = None if process.returncode == 0 else describe_exit(process.returncode)
+                result = {
+                    "stdout": stdout[:self.max_output_chars],
+                    "stderr": stderr[:self.max_output_chars],
+                    "error": error
+                }
+            except subprocess.TimeoutExpired:
+                # Kill the whole session, so children can't keep the pipes open
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                result = {"stdout": "", "stderr": "", "error": f"Execution timed out after {timeout}s"}
+        
+        result["success"] = result["error"] is None
+        result["duration"] = time.perf_counter() - started
+        return result
+    
+    def close(self):
+        """Stop every idle worker and remove the scratch directory"""
+        with self.lock:
+            while True:
+                try:
+                    self.idle.get_nowait().kill()
+                except queue.Empty:
+                    break
+            if self.workdir is not None:
+                shutil.rmtree(self.workdir, ignore_errors=True)
+                self.workdir = None
+
+class CodeExecutorTool(Tool):
+    """MCP Code Executor Tool"""
+    
+    def __init__(self, pool: Optional[WorkerPool] = None, settings: Dict[str, Any] = None):
+        settings = load_tool_settings("code_executor") if settings is None else settings
+        self.timeout = settings.get("timeout")
+        self.allowed_languages: List[str] = settings.get("allowed_languages", ["python"])
+        self.name = "code_executor"
+        self.description = "Run a code snippet in a resource-limited subprocess and return its output"
+        self.parameters = {
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "The code to run"
+                },
+                "language": {
+                    "type": "string",
+                    "enum": self.allowed_languages,
+                    "description": "The language of the code",
+                    "default": "python"
+                }
+            },
+            "required": ["code"]
+        }
+        # Workers start on the first run, not when the tool is created
+        self.pool = pool or WorkerPool.from_settings(settings)
+    
+    def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the code executor tool"""
+        code = params.get("code", "")
+        language = params.get("language", "python").lower()
+        
+        if language not in self.allowed_languages:
+            return {
+                "success": False,
+                "error": f"Language '{language}' is not allowed. Allowed: {', '.join(self.allowed_languages)}"
+            }
+        if language != "python" and language not in INTERPRETERS:
+            return {
+                "success": False,
+                "error": f"Language '{language}' is not supported"
+            }
+        
+        try:
+            if language == "python":
+                result = self.pool.run(code)
+            else:
+                result = self.pool.run_command(language, code)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Execution error: {str(e)}"
+            }
+        
+        output = result["stdout"].rstrip() or "(no output)"
+        if result["success"]:
+            result["formatted_result"] = f"Code execution ({language}, {result['duration']:.2f}s):\n{output}"
+        else:
+            result["formatted_result"] = f"Code execution failed ({language}): {result['error']}"
+        result["language"] = language
+        return result
+    
+    def get_schema(self) -> Dict[str, Any]:
+        """Get the tool schema for MCP"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": self.parameters
+        }
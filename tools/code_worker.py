@@ -0,0 +1,92 @@
+"""
+Code Worker - Long-lived interpreter used by the code executor pool
+Reads one JSON request per line on stdin, runs its code in a fresh namespace
+with output captured, and writes one JSON response per line. Started by
+tools/code_executor.py, which passes the resource limits to apply.
+
+Given a command after the limits, it applies them and execs the command
+instead, which is how the other languages' interpreters are limited.
+"""
+
+import builtins
+import io
+import json
+import os
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def apply_limits(memory_limit_mb: Optional[int], cpu_seconds: int, file_size_mb: int = 10, open_files: int = 64):
+    """Cap this process's memory, CPU time, file sizes and open files"""
+    if memory_limit_mb is not None:
+        memory = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    file_size = file_size_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (open_files, open_files))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+def _open_protocol():
+    """Take over stdin/stdout for requests and point fds 0-2 at /dev/null
+    
+    Snippets then can't read requests or corrupt responses, whether they
+    use sys.stdout, os.write(1, ...) or a child process.
+    """
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    sys.stdin = io.StringIO("")
+    return requests, responses
+
+def _limit_cpu(seconds: int):
+    """Allow this snippet `seconds` more CPU time than the worker has used so far"""
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def run(code: str, max_output: int) -> dict:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    error = None
+    try:
+        compiled = compile(code, "<snippet>", "exec")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exec(compiled, {"__name__": "__main__", "__builtins__": builtins})
+    except BaseException as e:
+        # Drop this function's frame from the traceback
+        error = "".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next))
+    return {
+        "stdout": stdout.getvalue()[:max_output],
+        "stderr": stderr.getvalue()[:max_output],
+        "error": error[-max_output:] if error else None,
+    }
+
+def main():
+    # Limits come as a JSON argument and are applied before any snippet runs
+    if len(sys.argv) > 1:
+        apply_limits(**json.loads(sys.argv[1]))
+    if len(sys.argv) > 2:
+        os.execvp(sys.argv[2], sys.argv[2:])
+    requests, responses = _open_protocol()
+    for line in requests:
+        request = json.loads(line)
+        _limit_cpu(request.get("cpu_seconds"))
+        response = run(request["code"], request.get("max_output", 10000))
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+if __name__ == "__main__":
+    main()
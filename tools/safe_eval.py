@@ -0,0 +1,371 @@
+"""
+Safe Expression Evaluator
+Parses arithmetic expressions with Python's ast module, allows only numbers,
+variables and arithmetic operators, and compiles them into cached closures.
+Expressions that differ only in their numbers share a template, so batches
+of similar formulas are evaluated in one NumPy pass.
+"""
+
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+from itertools import count
+from typing import Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+Number = Union[int, float]
+Outcome = Union[Number, Exception]
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPONENT = 10000
+MAX_INT_BITS = 4096
+MAX_TEMPLATES = 1024
+
+# Integers above this can't be represented exactly as float64
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+NUMBER_PATTERN = re.compile(r"(?<![\w.])((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(?![\w.])")
+
+class CalculationError(ValueError):
+    """Raised for expressions that are invalid, unsupported or too expensive"""
+
+def _check_int_size(value: Number) -> Number:
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise CalculationError(f"Result exceeds {MAX_INT_BITS} bits")
+    return value
+
+def _pow(base: Number, exponent: Number) -> Number:
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculationError(f"Exponent {exponent} exceeds the limit of {MAX_EXPONENT}")
+    # Estimate the result's size before computing it
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_INT_BITS:
+            raise CalculationError(f"Result exceeds {MAX_INT_BITS} bits")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise CalculationError("Result is not a real number")
+    return result
+
+def _mul(left: Number, right: Number) -> Number:
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_INT_BITS:
+            raise CalculationError(f"Result exceeds {MAX_INT_BITS} bits")
+    return left * right
+
+BINARY_OPERATORS = {
+    ast.Add: lambda left, right: _check_int_size(left + right),
+    ast.Sub: lambda left, right: _check_int_size(left - right),
+    ast.Mult: _mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _pow,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+def _vector_pow(base: np.ndarray, exponent: np.ndarray) -> np.ndarray:
+    # Rows over the exponent limit become NaN and are re-checked by the scalar path
+    return np.where(np.abs(exponent) > MAX_EXPONENT, np.nan, np.power(base, exponent))
+
+VECTOR_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: _vector_pow,
+}
+
+VECTOR_UNARY_OPERATORS = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+}
+
+class Template(NamedTuple):
+    """Compiled form shared by all expressions with the same structure
+    
+    `vector` evaluates many rows at once; see _compile_vector_node.
+    """
+    key: str
+    scalar: Callable
+    vector: Callable
+    names: FrozenSet[str]
+
+class CompiledExpression(NamedTuple):
+    template: Template
+    constants: Tuple[Number, ...]
+
+def _lookup(variables: Mapping, name: str):
+    try:
+        return variables[name]
+    except KeyError:
+        raise CalculationError(f"Unknown variable: {name}") from None
+
+def _scan(node: ast.AST, constants: List[Number], names: set) -> str:
+    """Validate a node, collect its constants and return its structural key"""
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CalculationError(f"Unsupported constant: {value!r}")
+        constants.append(value)
+        return "#"
+    
+    if isinstance(node, ast.Name):
+        if node.id.startswith("_"):
+            raise CalculationError(f"Invalid variable name: {node.id}")
+        names.add(node.id)
+        return node.id
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        left = _scan(node.left, constants, names)
+        right = _scan(node.right, constants, names)
+        return f"({left} {type(node.op).__name__} {right})"
+    
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        return f"({type(node.op).__name__} {_scan(node.operand, constants, names)})"
+    
+    raise CalculationError(f"Unsupported syntax: {type(node).__name__}")
+
+def _compile_node(node: ast.AST, binary: Dict, unary: Dict, slots: count) -> Callable:
+    """Turn a validated AST node into a closure over (constants, variables)"""
+    if isinstance(node, ast.Constant):
+        index = next(slots)
+        return lambda constants, variables: constants[index]
+    
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda constants, variables: _lookup(variables, name)
+    
+    if isinstance(node, ast.BinOp):
+        op = binary[type(node.op)]
+        left = _compile_node(node.left, binary, unary, slots)
+        right = _compile_node(node.right, binary, unary, slots)
+        return lambda constants, variables: op(left(constants, variables), right(constants, variables))
+    
+    op = unary[type(node.op)]
+    operand = _compile_node(node.operand, binary, unary, slots)
+    return lambda constants, variables: op(operand(constants, variables))
+
+def _vector_leaf(column: Tuple[np.ndarray, np.ndarray]):
+    values, integers = column
+    return values, integers, np.where(integers, np.abs(values), 0.0)
+
+def _compile_vector_node(node: ast.AST, slots: count) -> Callable:
+    """Like _compile_node with NumPy operators, also tracking integer rows
+    
+    Each column is a (values, integer mask) pair. The closures return the
+    values, which rows Python would compute as ints, and each row's largest
+    int magnitude so far.
+    """
+    if isinstance(node, ast.Constant):
+        index = next(slots)
+        return lambda constants, variables: _vector_leaf(constants[index])
+    
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda constants, variables: _vector_leaf(_lookup(variables, name))
+    
+    if isinstance(node, ast.BinOp):
+        op_type = type(node.op)
+        op = VECTOR_BINARY_OPERATORS[op_type]
+        left = _compile_vector_node(node.left, slots)
+        right = _compile_vector_node(node.right, slots)
+        
+        def binary(constants, variables):
+            left_value, left_integers, left_peak = left(constants, variables)
+            right_value, right_integers, right_peak = right(constants, variables)
+            value = op(left_value, right_value)
+            # Division always gives floats, and so does an int to a negative power
+            if op_type is ast.Div:
+                integers = False
+            elif op_type is ast.Pow:
+                integers = left_integers & right_integers & (right_value >= 0)
+            else:
+                integers = left_integers & right_integers
+            peak = np.fmax(np.fmax(left_peak, right_peak), np.where(integers, np.abs(value), 0.0))
+            return value, integers, peak
+        return binary
+    
+    # Unary plus and minus keep the type and magnitude
+    op = VECTOR_UNARY_OPERATORS[type(node.op)]
+    operand = _compile_vector_node(node.operand, slots)
+    
+    def unary(constants, variables):
+        value, integers, peak = operand(constants, variables)
+        return op(value), integers, peak
+    return unary
+
+def _compile_template(key: str, tree: ast.AST, names: set) -> Template:
+    return Template(
+        key=key,
+        scalar=_compile_node(tree, BINARY_OPERATORS, UNARY_OPERATORS, count()),
+        vector=_compile_vector_node(tree, count()),
+        names=frozenset(names),
+    )
+
+@lru_cache(maxsize=MAX_TEMPLATES)
+def _parse(source: str) -> CompiledExpression:
+    try:
+        tree = ast.parse(source.strip(), mode="eval").body
+        constants: List[Number] = []
+        names: set = set()
+        key = _scan(tree, constants, names)
+    except SyntaxError as e:
+        raise CalculationError(f"Invalid expression: {e.msg}") from None
+    except RecursionError:
+        raise CalculationError("Expression is nested too deeply") from None
+    return CompiledExpression(_compile_template(key, tree, names), tuple(constants))
+
+def _literal(text: str) -> Number:
+    return int(text) if text.isdigit() else float(text)
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse and compile an arithmetic expression, caching the result
+    
+    Number literals are swapped for placeholders before parsing, so
+    expressions that differ only in their numbers reuse one parsed template.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculationError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    
+    # split() alternates between the text around literals and the literals themselves
+    parts = NUMBER_PATTERN.split(expression)
+    literals = parts[1::2]
+    compiled = _parse("0".join(parts[::2]))
+    # A literal the pattern missed (hex, underscores...) shows up as an extra constant
+    if len(compiled.constants) == len(literals):
+        return compiled._replace(constants=tuple(map(_literal, literals)))
+    return _parse(expression)
+
+def evaluate(expression: str, variables: Mapping[str, Number] = None) -> Number:
+    """Safely evaluate an arithmetic expression
+    
+    Only numbers, variables, + - * / // % ** and parentheses are allowed.
+    Exponents and integer results are size-limited, which together with the
+    expression length limit bounds evaluation time.
+    """
+    compiled = compile_expression(expression)
+    return compiled.template.scalar(compiled.constants, variables or {})
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _integer_mask(column: Union[Number, Sequence[Number]]):
+    """Which values of a column are ints, as a bool or a bool array"""
+    if _is_number(column):
+        return isinstance(column, int)
+    types = set(map(type, column))
+    if int not in types:
+        return False
+    if types == {int}:
+        return True
+    return np.fromiter((isinstance(value, int) for value in column), dtype=bool, count=len(column))
+
+def _evaluate_rows(template: Template, constants: Sequence[Union[Number, Sequence[Number]]],
+                   variables: Mapping[str, Union[Number, Sequence[Number]]], rows: int) -> List[Outcome]:
+    """Evaluate one template over many rows in a single vectorized pass
+    
+    Each constant slot and variable is either a column with one value per
+    row or a number shared by all rows. Rows that come out non-finite, and
+    rows where an int input or intermediate result reaches 2**53 (so
+    float64 may have rounded what Python computes exactly), are recomputed
+    with the scalar path for exact results and error messages.
+    """
+    if rows == 0:
+        return []
+    
+    def row(column, i: int) -> Number:
+        return column if _is_number(column) else column[i]
+    
+    def scalar_row(i: int) -> Outcome:
+        try:
+            return template.scalar(
+                [row(column, i) for column in constants],
+                {name: row(column, i) for name, column in variables.items()},
+            )
+        except (CalculationError, ArithmeticError) as e:
+            return e
+    
+    def vector_column(column):
+        return np.asarray(column, dtype=np.float64), _integer_mask(column)
+    
+    constant_columns = [vector_column(column) for column in constants]
+    variable_columns = {name: vector_column(column) for name, column in variables.items()}
+    try:
+        with np.errstate(all="ignore"):
+            values, integer_rows, peaks = template.vector(constant_columns, variable_columns)
+    except CalculationError as e:
+        return [e] * rows
+    values = np.broadcast_to(values, (rows,))
+    integer_rows = np.broadcast_to(integer_rows, (rows,))
+    imprecise = np.broadcast_to(peaks, (rows,)) >= MAX_EXACT_FLOAT_INT
+    
+    with np.errstate(invalid="ignore"):
+        finite = np.isfinite(values)
+        exact = integer_rows & finite & ~imprecise & (values == np.floor(values))
+    
+    if exact.all():
+        return values.astype(np.int64).tolist()
+    
+    results: List[Outcome] = values.tolist()
+    exact_rows = np.flatnonzero(exact)
+    for i, value in zip(exact_rows.tolist(), values[exact_rows].astype(np.int64).tolist()):
+        results[i] = value
+    for i in np.flatnonzero(~finite | imprecise).tolist():
+        results[i] = scalar_row(i)
+    return results
+
+def evaluate_many(expressions: Sequence[str]) -> List[Outcome]:
+    """Evaluate a batch of expressions, vectorizing those with the same structure
+    
+    Returns one outcome per expression: the number, or the exception that
+    evaluating it raised.
+    """
+    results: List[Outcome] = [None] * len(expressions)
+    groups: Dict[str, Tuple[Template, List[int], List[Tuple[Number, ...]]]] = {}
+    for i, expression in enumerate(expressions):
+        try:
+            compiled = compile_expression(expression)
+        except CalculationError as e:
+            results[i] = e
+            continue
+        group = groups.setdefault(compiled.template.key, (compiled.template, [], []))
+        group[1].append(i)
+        group[2].append(compiled.constants)
+    
+    for template, indices, constant_rows in groups.values():
+        columns = [list(column) for column in zip(*constant_rows)]
+        for i, outcome in zip(indices, _evaluate_rows(template, columns, {}, len(indices))):
+            results[i] = outcome
+    return results
+
+def evaluate_bindings(expression: str, variables: Mapping[str, Union[Number, Sequence[Number]]]) -> List[Outcome]:
+    """Evaluate one expression over arrays of variable bindings in one pass
+    
+    Sequence values must all have the same length; plain numbers are shared
+    by every row.
+    """
+    compiled = compile_expression(expression)
+    columns = {}
+    for name, values in variables.items():
+        if not _is_number(values):
+            values = list(values)
+            if not set(map(type, values)) <= {int, float}:
+                raise CalculationError(f"Variable {name} must be a number or a list of numbers")
+        columns[name] = values
+    
+    lengths = {len(values) for values in columns.values() if not _is_number(values)}
+    if len(lengths) > 1:
+        raise CalculationError("Variable arrays must all have the same length")
+    rows = lengths.pop() if lengths else 1
+    
+    return _evaluate_rows(compiled.template, compiled.constants, columns, rows)
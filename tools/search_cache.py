@@ -0,0 +1,86 @@
+"""
+Search Cache
+Caches web search results per normalized query and shares in-flight fetches
+"""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from llm_cache import ResponseCache
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse its whitespace"""
+    return " ".join(query.lower().split())
+
+class SearchCache:
+    """Result cache with stampede protection in front of a search backend
+    
+    Results are cached per normalized query in a ResponseCache (LRU + TTL,
+    optional SQLite disk tier). Concurrent misses for the same query share
+    one backend call, and callers stop waiting after timeout seconds while
+    the fetch finishes in the background and still fills the cache.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600, disk_path: Optional[str] = None,
+                 enabled: bool = True, timeout: Optional[float] = None, max_workers: int = 8):
+        self.cache = ResponseCache(max_entries=max_entries, ttl=ttl, disk_path=disk_path) if enabled else None
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-search")
+        self.in_flight: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.shared = 0
+    
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "SearchCache":
+        """Build a cache from the tool_settings.web_search config section"""
+        return cls(
+            max_entries=settings.get("cache_max_entries", 256),
+            ttl=settings.get("cache_ttl", 3600),
+            disk_path=settings.get("cache_disk_path"),
+            enabled=settings.get("cache_results", True),
+            timeout=settings.get("timeout"),
+        )
+    
+    def search(self, backend, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Get results for a query from the cache, or from the backend on a miss"""
+        query = normalize_query(query)
+        # Entries remember how many results were asked for, so a cached
+        # top 10 also answers a later request for the top 5
+        request = {"tool": "web_search", "query": query}
+        if self.cache is not None:
+            cached = self.cache.get(request)
+            if cached is not None:
+                entry = json.loads(cached)
+                if max_results <= entry["limit"] or len(entry["results"]) < entry["limit"]:
+                    return entry["results"][:max_results]
+        
+        key = json.dumps([query, max_results])
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is None:
+                future = self.executor.submit(self._fetch, key, backend, request, max_results)
+                self.in_flight[key] = future
+            else:
+                self.shared += 1
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"Search for '{query}' timed out after {self.timeout}s") from None
+    
+    def _fetch(self, key: str, backend, request: Dict[str, Any], max_results: int) -> List[Dict[str, Any]]:
+        try:
+            results = backend.search(request["query"], max_results)
+            if self.cache is not None:
+                self.cache.put(request, json.dumps({"limit": max_results, "results": results}))
+            return results
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and how many calls joined an in-flight fetch"""
+        stats = self.cache.stats() if self.cache is not None else {}
+        stats['shared'] = self.shared
+        return stats
@@ -0,0 +1,268 @@
+"""
+Search Index
+BM25 ranking over a local JSON Lines corpus. The lexicon and postings are
+written to disk once and memory-mapped at query time, so corpora larger than
+RAM can be searched
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+SNIPPET_LENGTH = 200
+
+# Longer tokens are almost always encoded data rather than words
+MAX_TOKEN_LENGTH = 255
+
+# Block file record header: term length, number of (doc id, term frequency) pairs
+BLOCK_HEADER = struct.Struct("<HI")
+
+# Lexicon record: end of the term in lexicon_terms.bin, postings offset, document frequency
+LEXICON_RECORD = struct.Struct("<QQI")
+LEXICON_DTYPE = np.dtype([("term_end", "<u8"), ("offset", "<u8"), ("doc_frequency", "<u4")])
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens, dropping overlong ones"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH]
+
+def _document_text(document: Dict[str, Any]) -> str:
+    return f"{document.get('title', '')} {document.get('text') or document.get('snippet', '')}"
+
+def _write_block(block: Dict[str, array], path: str) -> str:
+    """Write one in-memory block of postings to disk, sorted by term"""
+    with open(path, "wb") as f:
+        for term in sorted(block):
+            encoded = term.encode("utf-8")
+            postings = block[term]
+            f.write(BLOCK_HEADER.pack(len(encoded), len(postings) // 2))
+            f.write(encoded)
+            f.write(postings.tobytes())
+    return path
+
+def _read_block(path: str) -> Iterator[Tuple[str, array]]:
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if not header:
+                return
+            term_length, pairs = BLOCK_HEADER.unpack(header)
+            term = f.read(term_length).decode("utf-8")
+            postings = array("I")
+            postings.frombytes(f.read(pairs * 2 * postings.itemsize))
+            yield term, postings
+
+def _merge_blocks(paths: List[str], index_dir: str) -> None:
+    """Merge sorted blocks into the final postings file and lexicon
+    
+    Each term's postings are stored as its document ids followed by its term
+    frequencies. Blocks hold increasing document ids, and heapq.merge keeps
+    equal terms in block order, so concatenated postings stay sorted.
+    
+    The lexicon is written as the terms' UTF-8 bytes back to back in
+    lexicon_terms.bin, plus one fixed-size record per term in lexicon.bin.
+    Terms come out of the merge sorted, so lexicon.bin can be binary-searched.
+    """
+    merged = heapq.merge(*(_read_block(path) for path in paths), key=lambda entry: entry[0])
+    offset = 0
+    with open(os.path.join(index_dir, "postings.bin"), "wb") as postings_file, \
+         open(os.path.join(index_dir, "lexicon_terms.bin"), "wb") as terms_file, \
+         open(os.path.join(index_dir, "lexicon.bin"), "wb") as lexicon_file:
+        current, pending = None, array("I")
+        for term, postings in merged:
+            if term != current and current is not None:
+                offset = _write_postings(postings_file, terms_file, lexicon_file, current, pending, offset)
+                pending = array("I")
+            current = term
+            pending.extend(postings)
+        if current is not None:
+            _write_postings(postings_file, terms_file, lexicon_file, current, pending, offset)
+
+def _write_postings(postings_file, terms_file, lexicon_file, term: str, postings: array, offset: int) -> int:
+    doc_frequency = len(postings) // 2
+    postings_file.write(postings[0::2].tobytes())
+    postings_file.write(postings[1::2].tobytes())
+    terms_file.write(term.encode("utf-8"))
+    lexicon_file.write(LEXICON_RECORD.pack(terms_file.tell(), offset, doc_frequency))
+    return offset + 2 * doc_frequency
+
+def build_index(corpus_path: str, index_dir: str, block_size: int = 5_000_000) -> "BM25Index":
+    """Build a BM25 index for a JSON Lines corpus
+    
+    Each line is a document with "title", "url" and "text" (or "snippet")
+    fields. Postings are collected in blocks of about block_size entries,
+    spilled to disk, and merged, so memory use doesn't grow with the corpus.
+    The corpus file is referenced rather than copied and must stay in place.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    lengths = array("I")
+    offsets = array("Q")
+    
+    with tempfile.TemporaryDirectory(dir=index_dir) as scratch, open(corpus_path, "rb") as corpus:
+        blocks: List[str] = []
+        block: Dict[str, array] = defaultdict(lambda: array("I"))
+        block_postings = 0
+        position = 0
+        
+        for line in corpus:
+            start = position
+            position += len(line)
+            if not line.strip():
+                continue
+            
+            tokens = tokenize(_document_text(json.loads(line)))
+            doc_id = len(lengths)
+            lengths.append(len(tokens))
+            offsets.append(start)
+            
+            counts = Counter(tokens)
+            for term, frequency in counts.items():
+                block[term].extend((doc_id, frequency))
+            block_postings += len(counts)
+            
+            if block_postings >= block_size:
+                blocks.append(_write_block(block, os.path.join(scratch, f"block_{len(blocks)}")))
+                block.clear()
+                block_postings = 0
+        
+        if block:
+            blocks.append(_write_block(block, os.path.join(scratch, f"block_{len(blocks)}")))
+        _merge_blocks(blocks, index_dir)
+    
+    with open(os.path.join(index_dir, "doc_lengths.bin"), "wb") as f:
+        f.write(lengths.tobytes())
+    with open(os.path.join(index_dir, "doc_offsets.bin"), "wb") as f:
+        f.write(offsets.tobytes())
+    with open(os.path.join(index_dir, "meta.json"), "w") as f:
+        json.dump({
+            "corpus": os.path.abspath(corpus_path),
+            "documents": len(lengths),
+            "average_length": sum(lengths) / len(lengths) if lengths else 0.0,
+        }, f, indent=2)
+    
+    return BM25Index(index_dir)
+
+def _map_array(path: str, dtype) -> np.ndarray:
+    # np.memmap can't map an empty file
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+class BM25Index:
+    """Search backend ranking documents of an index built by build_index()"""
+    
+    def __init__(self, index_dir: str, k1: float = 1.2, b: float = 0.75):
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        self.corpus_path = meta["corpus"]
+        self.document_count = meta["documents"]
+        self.average_length = meta["average_length"] or 1.0
+        
+        self._postings = _map_array(os.path.join(index_dir, "postings.bin"), np.uint32)
+        self._lengths = _map_array(os.path.join(index_dir, "doc_lengths.bin"), np.uint32)
+        self._offsets = _map_array(os.path.join(index_dir, "doc_offsets.bin"), np.uint64)
+        self._terms = _map_array(os.path.join(index_dir, "lexicon_terms.bin"), np.uint8)
+        self._lexicon = _map_array(os.path.join(index_dir, "lexicon.bin"), LEXICON_DTYPE)
+        self._corpus = None
+    
+    def _lookup(self, term: str) -> Optional[Tuple[int, int]]:
+        """Find a term's postings offset and document frequency by binary search"""
+        key = term.encode("utf-8")
+        term_ends = self._lexicon["term_end"]
+        low, high = 0, len(term_ends)
+        while low < high:
+            middle = (low + high) // 2
+            start = int(term_ends[middle - 1]) if middle else 0
+            if self._terms[start:int(term_ends[middle])].tobytes() < key:
+                low = middle + 1
+            else:
+                high = middle
+        
+        if low == len(term_ends):
+            return None
+        start = int(term_ends[low - 1]) if low else 0
+        if self._terms[start:int(term_ends[low])].tobytes() != key:
+            return None
+        return int(self._lexicon["offset"][low]), int(self._lexicon["doc_frequency"][low])
+    
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Return the best matching documents for a query, highest score first"""
+        doc_parts, score_parts = [], []
+        for term in set(tokenize(query)):
+            entry = self._lookup(term)
+            if entry is None:
+                continue
+            offset, doc_frequency = entry
+            docs = self._postings[offset:offset + doc_frequency]
+            frequencies = self._postings[offset + doc_frequency:offset + 2 * doc_frequency].astype(np.float64)
+            
+            idf = math.log(1 + (self.document_count - doc_frequency + 0.5) / (doc_frequency + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[docs] / self.average_length)
+            doc_parts.append(docs)
+            score_parts.append(idf * frequencies * (self.k1 + 1) / (frequencies + norm))
+        
+        if not doc_parts or max_results <= 0:
+            return []
+        
+        docs = np.concatenate(doc_parts)
+        scores = np.concatenate(score_parts)
+        if len(doc_parts) > 1:
+            # Sum the per-term scores of documents matching several terms
+            docs, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+        
+        k = min(max_results, len(docs))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self._document(int(docs[i]), float(scores[i])) for i in top]
+    
+    def _document(self, doc_id: int, score: float) -> Dict[str, Any]:
+        """Read a document back from the corpus and shape it as a search result"""
+        if self._corpus is None:
+            with open(self.corpus_path, "rb") as f:
+                self._corpus = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        start = int(self._offsets[doc_id])
+        end = self._corpus.find(b"\n", start)
+        document = json.loads(self._corpus[start:end if end != -1 else len(self._corpus)])
+        return {
+            "title": document.get("title", ""),
+            "snippet": document.get("snippet") or document.get("text", "")[:SNIPPET_LENGTH],
+            "url": document.get("url", ""),
+            "score": round(score, 4),
+        }
+    
+    def close(self) -> None:
+        if self._corpus is not None:
+            self._corpus.close()
+            self._corpus = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a local search index for the web_search tool")
+    parser.add_argument("corpus", help="JSON Lines file with title, url and text fields")
+    parser.add_argument("index_dir", help="Directory to write the index to")
+    parser.add_argument("--block-size", type=int, default=5_000_000,
+                        help="Postings to collect in memory before spilling to disk")
+    args = parser.parse_args()
+    
+    index = build_index(args.corpus, args.index_dir, block_size=args.block_size)
+    print(f"Indexed {index.document_count} documents into {args.index_dir}")
+    print(f"Set WEB_SEARCH_INDEX={args.index_dir} to search it with the web_search tool")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+Tool Settings
+Reads the tool_settings section of config/agent_config.json
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "agent_config.json")
+
+def load_tool_settings(tool_name: str, path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """Load one tool's settings, falling back to built-in defaults if the file is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("tool_settings", {}).get(tool_name, {})
@@ -3,12 +3,92 @@ Weather Tool for MCP Agent
 Provides weather information capabilities
 """
 
-from typing import Dict, Any
+import json
+from typing import Dict, Any, List
 
-class WeatherTool:
+import httpx
+
+from llm_cache import ResponseCache
+
+from .base import Tool
+from .settings import load_tool_settings
+
+# Mock weather data, used when no weather service is configured
+MOCK_WEATHER = {
+    "new york": {
+        "temperature": "72°F",
+        "condition": "Partly Cloudy",
+        "humidity": "65%",
+        "wind": "8 mph"
+    },
+    "london": {
+        "temperature": "15°C",
+        "condition": "Rainy",
+        "humidity": "80%",
+        "wind": "12 km/h"
+    },
+    "tokyo": {
+        "temperature": "25°C",
+        "condition": "Sunny",
+        "humidity": "55%",
+        "wind": "5 km/h"
+    },
+    "paris": {
+        "temperature": "18°C",
+        "condition": "Cloudy",
+        "humidity": "70%",
+        "wind": "10 km/h"
+    },
+    "sydney": {
+        "temperature": "22°C",
+        "condition": "Partly Cloudy",
+        "humidity": "60%",
+        "wind": "15 km/h"
+    }
+}
+
+# Default weather for unknown cities
+DEFAULT_WEATHER = {
+    "temperature": "20°C",
+    "condition": "Partly Cloudy",
+    "humidity": "65%",
+    "wind": "10 km/h"
+}
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.lower().split())
+
+class MockWeatherProvider:
+    """Weather provider answering from the built-in mock data"""
+    
+    def fetch(self, cities: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get weather for several normalized city names at once"""
+        return {city: MOCK_WEATHER.get(city, DEFAULT_WEATHER) for city in cities}
+
+class HTTPWeatherProvider:
+    """Weather provider fetching every requested city in one POST request
+    
+    Sends {"cities": [...]} to <base_url>/v1/weather and expects
+    {"weather": {city: data}} back. Requests share a pooled, kept-alive
+    connection. Run weather_stub_server.py for a local stand-in.
+    """
+    
+    def __init__(self, base_url: str, timeout: float = 10.0, client: httpx.Client = None):
+        self.url = base_url.rstrip("/") + "/v1/weather"
+        self.client = client or httpx.Client(timeout=timeout)
+    
+    def fetch(self, cities: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get weather for several normalized city names at once"""
+        response = self.client.post(self.url, json={"cities": cities})
+        response.raise_for_status()
+        return response.json()["weather"]
+
+class WeatherTool(Tool):
     """MCP Weather Tool"""
     
-    def __init__(self):
+    def __init__(self, provider=None, settings: Dict[str, Any] = None):
+        settings = load_tool_settings("weather") if settings is None else settings
+        self.timeout = settings.get("timeout")
         self.name = "weather"
         self.description = "Get current weather information for a city"
         self.parameters = {
@@ -17,18 +97,38 @@ class WeatherTool:
                 "city": {
                     "type": "string",
                     "description": "The city to get weather for"
+                },
+                "cities": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several cities to get weather for in one lookup"
                 }
-            },
-            "required": ["city"]
+            }
         }
+        
+        # Any object with fetch(cities) returning weather keyed by city
+        if provider is None:
+            provider_url = settings.get("provider_url")
+            provider = HTTPWeatherProvider(provider_url, timeout=self.timeout or 10.0) if provider_url else MockWeatherProvider()
+        self.provider = provider
+        
+        # Per-city results, kept briefly since weather changes
+        self.cache = ResponseCache(
+            max_entries=settings.get("cache_max_entries", 1024),
+            ttl=settings.get("cache_ttl", 300)
+        )
     
     def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the weather tool"""
+        if "cities" in params:
+            return self._execute_many(params["cities"])
+        
         city = params.get("city", "")
         
         try:
-            # Simulate weather data (in real implementation, use weather API)
-            weather_data = self._get_weather_data(city)
+            weather_data = self._get_weather_data([city]).get(normalize_city(city))
+            if weather_data is None:
+                raise ValueError(f"no data for {city}")
             
             return {
                 "success": True,
@@ -43,53 +143,72 @@ class WeatherTool:
                 "error": f"Weather error: {str(e)}"
             }
     
-    def _get_weather_data(self, city: str) -> Dict[str, Any]:
-        """Get weather data for a city"""
-        # Mock weather data
-        mock_weather = {
-            "new york": {
-                "temperature": "72°F",
-                "condition": "Partly Cloudy",
-                "humidity": "65%",
-                "wind": "8 mph"
-            },
-            "london": {
-                "temperature": "15°C",
-                "condition": "Rainy",
-                "humidity": "80%",
-                "wind": "12 km/h"
-            },
-            "tokyo": {
-                "temperature": "25°C",
-                "condition": "Sunny",
-                "humidity": "55%",
-                "wind": "5 km/h"
-            },
-            "paris": {
-                "temperature": "18°C",
-                "condition": "Cloudy",
-                "humidity": "70%",
-                "wind": "10 km/h"
-            },
-            "sydney": {
-                "temperature": "22°C",
-                "condition": "Partly Cloudy",
-                "humidity": "60%",
-                "wind": "15 km/h"
+    def _execute_many(self, cities: List[str]) -> Dict[str, Any]:
+        """Get weather for several cities with one provider call for the uncached ones"""
+        if not isinstance(cities, list):
+            return {
+                "success": False,
+                "error": "cities must be a list of strings"
             }
-        }
         
-        city_lower = city.lower()
-        if city_lower in mock_weather:
-            return mock_weather[city_lower]
-        else:
-            # Default weather for unknown cities
+        try:
+            weather = self._get_weather_data([city for city in cities if isinstance(city, str)])
+        except Exception as e:
             return {
-                "temperature": "20°C",
-                "condition": "Partly Cloudy",
-                "humidity": "65%",
-                "wind": "10 km/h"
+                "success": False,
+                "error": f"Weather error: {str(e)}"
             }
+        
+        results = []
+        for city in cities:
+            if not isinstance(city, str):
+                results.append({
+                    "success": False,
+                    "error": f"Weather error: city must be a string, not {type(city).__name__}"
+                })
+                continue
+            
+            weather_data = weather.get(normalize_city(city))
+            if weather_data is None:
+                results.append({
+                    "success": False,
+                    "city": city,
+                    "error": f"Weather error: no data for {city}"
+                })
+            else:
+                results.append({
+                    "success": True,
+                    "weather": weather_data,
+                    "city": city,
+                    "formatted_result": f"Weather for {city}: {weather_data['temperature']}, {weather_data['condition']}"
+                })
+        
+        return {
+            "success": any(result["success"] for result in results),
+            "results": results,
+            "cities": cities,
+            "formatted_result": "\n".join(result.get("formatted_result", result.get("error")) for result in results)
+        }
+    
+    def _get_weather_data(self, cities: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get weather keyed by normalized city name, fetching cache misses in one call"""
+        weather = {}
+        missing = []
+        for city in dict.fromkeys(normalize_city(city) for city in cities):
+            cached = self.cache.get({"tool": "weather", "city": city})
+            if cached is not None:
+                weather[city] = json.loads(cached)
+            else:
+                missing.append(city)
+        
+        if missing:
+            fetched = self.provider.fetch(missing)
+            for city in missing:
+                if city in fetched:
+                    weather[city] = fetched[city]
+                    self.cache.put({"tool": "weather", "city": city}, json.dumps(fetched[city]))
+        
+        return weather
     
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool schema for MCP"""
@@ -3,12 +3,95 @@ Web Search Tool for MCP Agent
 Provides web search capabilities
 """
 
+import os
 from typing import Dict, Any, List
 
-class WebSearchTool:
+from .base import Tool
+from .search_cache import SearchCache
+from .search_index import BM25Index
+from .settings import load_tool_settings
+
+# Mock search results, used when no local index is configured
+MOCK_RESULTS = {
+    "python": [
+        {
+            "title": "Python Programming Language",
+            "snippet": "Python is a high-level programming language known for its simplicity and readability.",
+            "url": "https://python.org"
+        },
+        {
+            "title": "Python Tutorial",
+            "snippet": "Learn Python programming with comprehensive tutorials and examples.",
+            "url": "https://docs.python.org/tutorial"
+        }
+    ],
+    "machine learning": [
+        {
+            "title": "Machine Learning Basics",
+            "snippet": "Machine learning is a subset of artificial intelligence that enables systems to learn from data.",
+            "url": "https://example.com/ml-basics"
+        }
+    ],
+    "weather": [
+        {
+            "title": "Weather Information",
+            "snippet": "Weather information can be found through various online services and APIs.",
+            "url": "https://example.com/weather"
+        }
+    ],
+    "capital": [
+        {
+            "title": "World Capitals",
+            "snippet": "Capitals are the primary cities of countries, often housing government buildings.",
+            "url": "https://example.com/capitals"
+        }
+    ]
+}
+
+class MockSearchBackend:
+    """Search backend matching queries against a fixed set of keywords"""
+    
+    def __init__(self, results: Dict[str, List[Dict[str, Any]]] = MOCK_RESULTS):
+        self.results = {keyword.lower(): keyword_results for keyword, keyword_results in results.items()}
+    
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Return the results of every keyword found in the query"""
+        query_lower = query.lower()
+        results = []
+        for keyword, keyword_results in self.results.items():
+            if keyword in query_lower:
+                results.extend(keyword_results)
+        
+        # If no specific matches, provide generic results
+        if not results:
+            results = [
+                {
+                    "title": f"Search Results for '{query}'",
+                    "snippet": f"Found relevant information about {query}",
+                    "url": f"https://example.com/search?q={query}"
+                }
+            ]
+        
+        return results[:max_results]
+
+def load_search_backend(index_dir: str = None, fallback=None):
+    """Open the local search index if one is configured, else use the fallback
+    
+    The index directory comes from the argument or the WEB_SEARCH_INDEX
+    environment variable; build one with `python -m tools.search_index`.
+    """
+    index_dir = index_dir or os.getenv("WEB_SEARCH_INDEX")
+    if index_dir:
+        return BM25Index(index_dir)
+    return fallback or MockSearchBackend()
+
+class WebSearchTool(Tool):
     """MCP Web Search Tool"""
     
-    def __init__(self):
+    def __init__(self, backend=None, settings: Dict[str, Any] = None):
+        settings = load_tool_settings("web_search") if settings is None else settings
+        self.max_results = settings.get("max_results", 5)
+        self.timeout = settings.get("timeout")
         self.name = "web_search"
         self.description = "Search the web for current information"
         self.parameters = {
@@ -21,20 +104,22 @@ class WebSearchTool:
                 "max_results": {
                     "type": "integer",
                     "description": "Maximum number of results to return",
-                    "default": 5
+                    "default": self.max_results
                 }
             },
             "required": ["query"]
         }
+        # Any object with search(query, max_results) returning result dicts
+        self.backend = backend or load_search_backend()
+        self.cache = SearchCache.from_settings(settings)
     
     def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the web search tool"""
         query = params.get("query", "")
-        max_results = params.get("max_results", 5)
+        max_results = params.get("max_results", self.max_results)
         
         try:
-            # Simulate web search (in real implementation, use actual search API)
-            results = self._simulate_search(query, max_results)
+            results = self.cache.search(self.backend, query, max_results)
             
             return {
                 "success": True,
@@ -49,65 +134,6 @@ class WebSearchTool:
                 "error": f"Search error: {str(e)}"
             }
     
-    def _simulate_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Simulate web search results"""
-        # Mock search results
-        mock_results = {
-            "python": [
-                {
-                    "title": "Python Programming Language",
-                    "snippet": "Python is a high-level programming language known for its simplicity and readability.",
-                    "url": "https://python.org"
-                },
-                {
-                    "title": "Python Tutorial",
-                    "snippet": "Learn Python programming with comprehensive tutorials and examples.",
-                    "url": "https://docs.python.org/tutorial"
-                }
-            ],
-            "machine learning": [
-                {
-                    "title": "Machine Learning Basics",
-                    "snippet": "Machine learning is a subset of artificial intelligence that enables systems to learn from data.",
-                    "url": "https://example.com/ml-basics"
-                }
-            ],
-            "weather": [
-                {
-                    "title": "Weather Information",
-                    "snippet": "Weather information can be found through various online services and APIs.",
-                    "url": "https://example.com/weather"
-                }
-            ],
-            "capital": [
-                {
-                    "title": "World Capitals",
-                    "snippet": "Capitals are the primary cities of countries, often housing government buildings.",
-                    "url": "https://example.com/capitals"
-                }
-            ]
-        }
-        
-        # Find matching results
-        results = []
-        query_lower = query.lower()
-        
-        for keyword, keyword_results in mock_results.items():
-            if keyword.lower() in query_lower:
-                results.extend(keyword_results)
-        
-        # If no specific matches, provide generic results
-        if not results:
-            results = [
-                {
-                    "title": f"Search Results for '{query}'",
-                    "snippet": f"Found relevant information about {query}",
-                    "url": f"https://example.com/search?q={query}"
-                }
-            ]
-        
-        return results[:max_results]
-    
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool schema for MCP"""
         return {
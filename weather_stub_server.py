@@ -0,0 +1,72 @@
+"""
+Weather Stub Server - A local stand-in for a batched weather service
+Answers POST /v1/weather {"cities": [...]} from the weather tool's mock data,
+so HTTPWeatherProvider can be exercised offline:
+
+    python weather_stub_server.py --port 8766
+    # then set tool_settings.weather.provider_url to http://127.0.0.1:8766
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from tools.weather import MockWeatherProvider
+
+class WeatherStubHandler(BaseHTTPRequestHandler):
+    """Request handler for the batched weather endpoint"""
+    
+    protocol_version = "HTTP/1.1"
+    provider = MockWeatherProvider()
+    
+    def do_POST(self):
+        if self.path.split("?")[0] != "/v1/weather":
+            self._send_json({"error": f"not found: {self.path}"}, 404)
+            return
+        
+        body = self._read_json()
+        cities = body.get("cities")
+        if not isinstance(cities, list):
+            self._send_json({"error": "expected a list of cities"}, 400)
+            return
+        self._send_json({"weather": self.provider.fetch([str(city).lower() for city in cities])})
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+    
+    def _send_json(self, payload: Dict[str, Any], status: int = 200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_weather_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub server on a background thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), WeatherStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stand-in for a batched weather service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer((args.host, args.port), WeatherStubHandler)
+    print(f"🌤️  Stub weather service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stub server stopped")
+
+if __name__ == "__main__":
+    main()